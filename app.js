@@ -117,12 +117,54 @@ const ingredients = {
   ]
 };
 
+// Every catalog name has a numeric ID. Cards and buttons carry it as data-ingredient-id,
+// so delegated handlers find the ingredient without quoting names into markup.
+const ingredientNames = [...new Set(Object.values(ingredients).flat())];
+const ingredientIds = new Map(ingredientNames.map((name, id) => [name, id]));
+
+// Selected ingredients, in the order they were picked. Subscribers are told which
+// ingredients were added and removed, so views update just those.
+function createSelectionStore() {
+  const selected = new Set();
+  const listeners = [];
+  const notify = (added, removed) => listeners.forEach(listener => listener({ added, removed }));
+
+  return {
+    has: (ingredient) => selected.has(ingredient),
+    get size() { return selected.size; },
+    values: () => [...selected],
+    toggle(ingredient) {
+      if (selected.delete(ingredient)) notify([], [ingredient]);
+      else {
+        selected.add(ingredient);
+        notify([ingredient], []);
+      }
+    },
+    clear() {
+      const removed = [...selected];
+      selected.clear();
+      if (removed.length) notify([], removed);
+    },
+    subscribe: (listener) => listeners.push(listener)
+  };
+}
+
 // UI variables
-let selectedIngredients = [];
+const selection = createSelectionStore();
 let currentView = 'home';
+let recipeCursor = null;
+let pairings = null;
+
+// Suggestions shown next to the selection, from the table built by build_pairings.py
+const SUGGESTION_COUNT = 6;
+
+// Fields the recipe list needs; ingredients and instructions load from /recipes/:id
+// when a card's details are opened
+const LIST_FIELDS = ['id', 'title', 'description', 'time', 'servings', 'dietary_labels', 'sourceUrl'];
 
 // Initialize app
 document.addEventListener('DOMContentLoaded', function() {
+  selection.subscribe(onSelectionChange);
   setupEventListeners();
   renderIngredientSelection();
   updateSelectedIngredientsUI();
@@ -138,9 +180,19 @@ function setupEventListeners() {
   // Search
   const searchInput = document.getElementById('ingredientSearch');
   if (searchInput) {
-    searchInput.addEventListener('input', (e) => renderIngredientSelection(e.target.value));
+    let searchTimer = null;
+    searchInput.addEventListener('input', (e) => {
+      clearTimeout(searchTimer);
+      searchTimer = setTimeout(() => renderIngredientSelection(e.target.value), SEARCH_DEBOUNCE_MS);
+    });
   }
 
+  // Ingredient cards, selected chips and suggestions: one click handler per container
+  ['ingredientContainer', 'selectedIngredients', 'ingredientSuggestions'].forEach(id => {
+    const container = document.getElementById(id);
+    if (container) container.addEventListener('click', toggleClickedIngredient);
+  });
+
   // Recipe generation
   const generateBtn = document.getElementById('generateRecipes');
   if (generateBtn) {
@@ -152,6 +204,14 @@ function setupEventListeners() {
   if (clearBtn) {
     clearBtn.addEventListener('click', clearIngredients);
   }
+
+  // Recipe details load on first open; toggle doesn't bubble, so listen in the capture phase
+  const recipesContainer = document.getElementById('recipesContainer');
+  if (recipesContainer) {
+    recipesContainer.addEventListener('toggle', (e) => {
+      if (e.target.matches('.recipe-details') && e.target.open) loadRecipeDetails(e.target);
+    }, true);
+  }
 }
 
 function showView(view) {
@@ -174,95 +234,480 @@ function showView(view) {
   }
 }
 
-function renderIngredientSelection(filter = '') {
-  const container = document.getElementById('ingredientContainer');
-  if (!container) return;
+// Ingredient search. Names are normalised (case, accents, punctuation) and split into
+// tokens once; text in brackets counts as an alias ("Cumin Seeds (Jeera)"). Every query
+// token must match a token of the entry exactly, as a prefix, or within a small edit
+// distance ("tumeric"), and entries are ranked by how well they match.
+const SEARCH_DEBOUNCE_MS = 120;
+const ALIAS_WEIGHT = 0.9;
+let searchIndex = null;
 
-  container.innerHTML = '';
+function normalizeSearchText(text) {
+  return text.toLowerCase().normalize('NFD').replace(/[\u0300-\u036f]/g, '').replace(/[^a-z0-9]+/g, ' ').trim();
+}
 
-  Object.keys(ingredients).forEach(category => {
-    const categoryItems = ingredients[category].filter(item =>
-      item.toLowerCase().includes(filter.toLowerCase())
-    );
+function buildSearchIndex() {
+  const entries = [];
+  const postings = new Map(); // token -> Map(entry index -> weight)
+  const deletions = new Map(); // token with letters deleted -> [token], for typo candidates
+
+  const addToken = (token, index, weight) => {
+    if (!postings.has(token)) {
+      postings.set(token, new Map());
+      deletionVariants(token, token.length >= 6 ? 2 : token.length >= 3 ? 1 : 0).forEach(variant => {
+        if (!deletions.has(variant)) deletions.set(variant, []);
+        deletions.get(variant).push(token);
+      });
+    }
+    const entryWeights = postings.get(token);
+    entryWeights.set(index, Math.max(entryWeights.get(index) || 0, weight));
+  };
+
+  ingredientNames.forEach((name, index) => {
+    entries.push({ name, normalized: normalizeSearchText(name) });
+    normalizeSearchText(name.replace(/\(.*?\)/g, ' ')).split(' ').filter(Boolean).forEach(token => addToken(token, index, 1));
+    (name.match(/\((.*?)\)/g) || []).forEach(alias => {
+      normalizeSearchText(alias).split(' ').filter(Boolean).forEach(token => addToken(token, index, ALIAS_WEIGHT));
+    });
+  });
+
+  return { entries, postings, deletions, vocabulary: [...postings.keys()].sort() };
+}
+
+// The strings left after deleting up to `edits` letters. Two words within that edit
+// distance share one of them, so typo candidates are a map lookup rather than a scan.
+function deletionVariants(word, edits) {
+  const variants = new Set([word]);
+  let level = variants;
+  for (let i = 0; i < edits; i++) {
+    const next = new Set();
+    level.forEach(text => {
+      for (let j = 0; j < text.length; j++) next.add(text.slice(0, j) + text.slice(j + 1));
+    });
+    next.forEach(text => variants.add(text));
+    level = next;
+  }
+  return variants;
+}
+
+// Optimal string alignment distance, giving up once it must exceed max
+function editDistance(a, b, max) {
+  if (Math.abs(a.length - b.length) > max) return max + 1;
+  let previous2 = null;
+  let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+  for (let i = 1; i <= a.length; i++) {
+    const current = [i];
+    let rowMin = i;
+    for (let j = 1; j <= b.length; j++) {
+      const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+      let value = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+      if (previous2 && i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+        value = Math.min(value, previous2[j - 2] + 1);
+      }
+      current.push(value);
+      rowMin = Math.min(rowMin, value);
+    }
+    if (rowMin > max) return max + 1;
+    previous2 = previous;
+    previous = current;
+  }
+  return previous[b.length];
+}
+
+// Best score per entry for one query token
+function matchToken(index, token) {
+  const scores = new Map();
+  const add = (candidate, score) => {
+    index.postings.get(candidate).forEach((weight, entry) => {
+      scores.set(entry, Math.max(scores.get(entry) || 0, score * weight));
+    });
+  };
+
+  // Exact and prefix matches: a contiguous run of the sorted vocabulary
+  let low = 0;
+  let high = index.vocabulary.length;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (index.vocabulary[mid] < token) low = mid + 1;
+    else high = mid;
+  }
+  for (let i = low; i < index.vocabulary.length && index.vocabulary[i].startsWith(token); i++) {
+    const candidate = index.vocabulary[i];
+    add(candidate, candidate === token ? 1 : 0.6 + 0.3 * token.length / candidate.length);
+  }
+
+  // Typos: one edit from 4 letters, two from 8
+  const maxEdits = token.length >= 8 ? 2 : token.length >= 4 ? 1 : 0;
+  const candidates = new Set();
+  if (maxEdits) {
+    deletionVariants(token, maxEdits).forEach(variant => {
+      (index.deletions.get(variant) || []).forEach(candidate => candidates.add(candidate));
+    });
+  }
+  candidates.forEach(candidate => {
+    if (candidate === token) return;
+    const distance = editDistance(token, candidate, maxEdits);
+    if (distance <= maxEdits) add(candidate, 0.7 - 0.2 * distance);
+  });
+  return scores;
+}
+
+// Catalog names matching the query, best first
+function searchIngredients(query, limit = Infinity) {
+  if (!searchIndex) searchIndex = buildSearchIndex();
+  const normalized = normalizeSearchText(query);
+  if (!normalized) return [];
+
+  const perToken = normalized.split(' ').map(token => matchToken(searchIndex, token));
+  perToken.sort((a, b) => a.size - b.size);
+
+  const results = [];
+  perToken[0].forEach((score, entry) => {
+    let total = score;
+    for (let i = 1; i < perToken.length; i++) {
+      if (!perToken[i].has(entry)) return;
+      total += perToken[i].get(entry);
+    }
+    const { name, normalized: entryName } = searchIndex.entries[entry];
+    if (entryName === normalized) total += 1;
+    else if (entryName.startsWith(normalized)) total += 0.5;
+    results.push({ name, score: total, entry });
+  });
+
+  results.sort((a, b) => b.score - a.score || a.name.length - b.name.length || a.entry - b.entry);
+  return results.slice(0, limit).map(result => result.name);
+}
+
+// Cards are built once and kept by ingredient; filtering and selection only toggle
+// visibility and classes on the existing nodes. An ingredient listed in two categories
+// has a card in each.
+//
+// Catalogs of VIRTUAL_GRID_MIN_ITEMS or more use the virtualized grid instead: only the
+// rows near the viewport have cards, recycled through a pool as the page scrolls, so the
+// DOM stays the same size however large the catalog grows.
+const VIRTUAL_GRID_MIN_ITEMS = 300;
+const VIRTUAL_OVERSCAN_ROWS = 3;
+
+const ingredientCards = new Map(); // ingredient -> [card] in the DOM
+const categorySections = new Map(); // category -> { element, grid, count, items, matches, mounted }
+const cardPool = [];
+let virtualGrid = false;
+let virtualFrame = null;
+
+function buildIngredientSelection(container) {
+  virtualGrid = ingredientNames.length >= VIRTUAL_GRID_MIN_ITEMS;
+  container.classList.toggle('virtual', virtualGrid);
 
-    if (categoryItems.length === 0) return;
+  Object.keys(ingredients).forEach(category => {
+    const element = document.createElement('section');
+    element.className = 'category-section';
 
     // Category header
-    const categoryHeader = document.createElement('div');
-    categoryHeader.className = 'category-header';
-    categoryHeader.innerHTML = `
+    const header = document.createElement('div');
+    header.className = 'category-header';
+    header.innerHTML = `
       <h3>${formatCategoryName(category)}</h3>
-      <span class="category-count">${categoryItems.length} items</span>
+      <span class="category-count"></span>
     `;
-    container.appendChild(categoryHeader);
+    element.appendChild(header);
 
     // Ingredients grid
     const grid = document.createElement('div');
     grid.className = 'ingredients-grid';
+    const items = ingredients[category].map(ingredient => ({ ingredient, card: null }));
 
-    categoryItems.forEach(ingredient => {
-      const card = document.createElement('div');
-      card.className = `ingredient-card ${selectedIngredients.includes(ingredient) ? 'selected' : ''}`;
-      card.innerHTML = `
-        <span class="ingredient-name">${ingredient}</span>
-        <span class="ingredient-action">+</span>
-      `;
+    if (!virtualGrid) {
+      items.forEach(item => {
+        item.card = createIngredientCard();
+        assignCard(item.card, item.ingredient);
+        grid.appendChild(item.card);
+      });
+    }
+
+    element.appendChild(grid);
+    container.appendChild(element);
+    categorySections.set(category, {
+      element,
+      grid,
+      count: header.querySelector('.category-count'),
+      items,
+      matches: items,
+      mounted: new Map() // ingredient -> card, virtualized grid only
+    });
+  });
+
+  if (virtualGrid) {
+    window.addEventListener('scroll', scheduleVirtualWindow, { passive: true });
+    window.addEventListener('resize', scheduleVirtualWindow);
+  }
+}
+
+function createIngredientCard() {
+  const card = document.createElement('div');
+  card.className = 'ingredient-card';
+  card.innerHTML = `
+    <span class="ingredient-name"></span>
+    <span class="ingredient-action">+</span>
+  `;
+  return card;
+}
+
+// Points a card at an ingredient, keeping ingredientCards and the selected class in step
+function assignCard(card, ingredient) {
+  card.dataset.ingredientId = ingredientIds.get(ingredient);
+  card.querySelector('.ingredient-name').textContent = ingredient;
+  if (!ingredientCards.has(ingredient)) ingredientCards.set(ingredient, []);
+  ingredientCards.get(ingredient).push(card);
+  card.classList.toggle('selected', selection.has(ingredient));
+}
+
+function releaseCard(card) {
+  const ingredient = ingredientNames[card.dataset.ingredientId];
+  const cards = ingredientCards.get(ingredient).filter(other => other !== card);
+  if (cards.length) ingredientCards.set(ingredient, cards);
+  else ingredientCards.delete(ingredient);
+  card.remove();
+  cardPool.push(card);
+}
+
+function renderIngredientSelection(filter = '') {
+  const container = document.getElementById('ingredientContainer');
+  if (!container) return;
+
+  if (!categorySections.size) buildIngredientSelection(container);
+
+  // Without a query everything shows in catalog order; with one, matches show best first
+  // and so do the categories holding them
+  const rank = filter.trim() ? new Map(searchIngredients(filter).map((name, i) => [name, i])) : null;
+  const sections = [...categorySections.values()].map(section => {
+    section.matches = rank
+      ? section.items.filter(({ ingredient }) => rank.has(ingredient)).sort((a, b) => rank.get(a.ingredient) - rank.get(b.ingredient))
+      : section.items;
+    const { matches } = section;
+    return { section, best: !matches.length ? Infinity : rank ? rank.get(matches[0].ingredient) : 0 };
+  });
 
-      card.addEventListener('click', () => toggleIngredient(ingredient));
-      grid.appendChild(card);
+  sections.forEach(({ section }) => {
+    const { element, grid, count, items, matches } = section;
+    if (!virtualGrid) {
+      const shown = new Set(matches);
+      items.forEach(item => setShown(item.card, shown.has(item)));
+      placeInOrder(grid, matches.map(item => item.card));
+    }
+
+    setShown(element, matches.length > 0);
+    const label = `${matches.length} items`;
+    if (count.textContent !== label) count.textContent = label;
+  });
+
+  sections.sort((a, b) => a.best - b.best);
+  placeInOrder(container, sections.map(({ section }) => section.element));
+
+  if (virtualGrid) renderVirtualWindow();
+}
+
+function scheduleVirtualWindow() {
+  if (!virtualFrame) virtualFrame = requestAnimationFrame(renderVirtualWindow);
+}
+
+// Gives each grid the full height of its rows and materialises the cards of rows within
+// the viewport plus an overscan margin, with the rows above them as top padding. Scroll
+// height and the sticky category headers behave as if every card were there. Layout is
+// read and written in separate passes to avoid forced reflows.
+function renderVirtualWindow() {
+  virtualFrame = null;
+  const container = document.getElementById('ingredientContainer');
+  if (!container || !container.offsetWidth) return; // view hidden
+
+  const sections = [...categorySections.values()].filter(section => section.matches.length);
+  if (!sections.length) return;
+
+  // Rows have a fixed height in this mode (see .ingredients-container.virtual in style.css);
+  // the computed column template lists one size per track
+  const styles = getComputedStyle(sections[0].grid);
+  const rowGap = parseFloat(styles.rowGap) || 0;
+  const rowPitch = parseFloat(styles.gridAutoRows) + rowGap;
+  const columns = Math.max(1, styles.gridTemplateColumns.split(' ').length);
+  const navbar = document.querySelector('.navbar');
+  const stickyTop = navbar ? navbar.offsetHeight : 0;
+
+  sections.forEach(section => {
+    const rows = Math.ceil(section.matches.length / columns);
+    const height = `${Math.max(0, rows * rowPitch - rowGap)}px`;
+    if (section.grid.style.height !== height) section.grid.style.height = height;
+  });
+  container.style.setProperty('--sticky-top', `${stickyTop}px`);
+
+  const tops = sections.map(section => section.grid.getBoundingClientRect().top);
+  const overscan = VIRTUAL_OVERSCAN_ROWS * rowPitch;
+
+  const windows = sections.map((section, i) => {
+    const rows = Math.ceil(section.matches.length / columns);
+    const first = Math.min(rows, Math.max(0, Math.floor((stickyTop - tops[i] - overscan) / rowPitch)));
+    const last = Math.min(rows, Math.max(first, Math.ceil((window.innerHeight - tops[i] + overscan) / rowPitch)));
+    return { section, first, visible: section.matches.slice(first * columns, last * columns) };
+  });
+
+  // Cards that scrolled out, or belong to sections filtered out entirely, go back to the
+  // pool before any are taken from it
+  const windowed = new Map(windows.map(({ section, visible }) => [section, new Set(visible.map(item => item.ingredient))]));
+  categorySections.forEach(section => {
+    const wanted = windowed.get(section);
+    section.mounted.forEach((card, ingredient) => {
+      if (wanted && wanted.has(ingredient)) return;
+      releaseCard(card);
+      section.mounted.delete(ingredient);
     });
+  });
 
-    container.appendChild(grid);
+  windows.forEach(({ section, first, visible }) => {
+    const cards = visible.map(({ ingredient }) => {
+      let card = section.mounted.get(ingredient);
+      if (!card) {
+        card = cardPool.pop() || createIngredientCard();
+        assignCard(card, ingredient);
+        section.mounted.set(ingredient, card);
+      }
+      return card;
+    });
+
+    const paddingTop = `${first * rowPitch}px`;
+    if (section.grid.style.paddingTop !== paddingTop) section.grid.style.paddingTop = paddingTop;
+    placeInOrder(section.grid, cards);
   });
 }
 
+// Puts nodes in the given order, moving only those out of place; other children of
+// parent (hidden cards) are stepped over and stay where they are
+function placeInOrder(parent, nodes) {
+  const wanted = new Set(nodes);
+  let next = parent.firstChild;
+  nodes.forEach(node => {
+    while (next && !wanted.has(next)) next = next.nextSibling;
+    if (node === next) next = node.nextSibling;
+    else parent.insertBefore(node, next);
+  });
+}
+
+// Only touches the style when it changes, so unchanged cards cost no style recalculation
+function setShown(element, shown) {
+  const display = shown ? '' : 'none';
+  if (element.style.display !== display) element.style.display = display;
+}
+
+function syncIngredientCards(ingredient) {
+  const selected = selection.has(ingredient);
+  (ingredientCards.get(ingredient) || []).forEach(card => card.classList.toggle('selected', selected));
+}
+
 function formatCategoryName(category) {
   return category.replace(/_/g, ' ').replace(/\b\w/g, l => l.toUpperCase());
 }
 
-function toggleIngredient(ingredient) {
-  const index = selectedIngredients.indexOf(ingredient);
-  if (index > -1) {
-    selectedIngredients.splice(index, 1);
-  } else {
-    selectedIngredients.push(ingredient);
-  }
+// Toggles the ingredient of the clicked card or button
+function toggleClickedIngredient(e) {
+  const target = e.target.closest('[data-ingredient-id]');
+  if (target) selection.toggle(ingredientNames[target.dataset.ingredientId]);
+}
 
-  updateSelectedIngredientsUI();
-  renderIngredientSelection(document.getElementById('ingredientSearch')?.value || '');
+function onSelectionChange(changes) {
+  changes.added.forEach(syncIngredientCards);
+  changes.removed.forEach(syncIngredientCards);
+  updateSelectedIngredientsUI(changes);
 }
 
-function updateSelectedIngredientsUI() {
+const selectedChips = new Map(); // ingredient -> chip
+
+// Adds and removes the chips of changed ingredients; without changes, adds the whole selection
+function updateSelectedIngredientsUI({ added = selection.values(), removed = [] } = {}) {
   const container = document.getElementById('selectedIngredients');
   const count = document.getElementById('selectedCount');
 
   if (count) {
-    count.textContent = selectedIngredients.length;
+    count.textContent = selection.size;
+  }
+
+  if (!container) return;
+
+  renderSuggestions();
+
+  removed.forEach(ingredient => {
+    const chip = selectedChips.get(ingredient);
+    if (!chip) return;
+    chip.remove();
+    selectedChips.delete(ingredient);
+  });
+
+  added.forEach(ingredient => {
+    if (selectedChips.has(ingredient)) return;
+    const removeBtn = document.createElement('button');
+    removeBtn.className = 'remove-btn';
+    removeBtn.dataset.ingredientId = ingredientIds.get(ingredient);
+    removeBtn.innerHTML = '&times;';
+
+    const chip = document.createElement('span');
+    chip.className = 'selected-ingredient';
+    chip.textContent = ingredient;
+    chip.appendChild(removeBtn);
+    selectedChips.set(ingredient, chip);
+    container.appendChild(chip);
+  });
+
+  let emptyState = container.querySelector('.empty-state');
+  if (!emptyState) {
+    emptyState = document.createElement('p');
+    emptyState.className = 'empty-state';
+    emptyState.textContent = 'No ingredients selected';
+    container.appendChild(emptyState);
   }
+  setShown(emptyState, selection.size === 0);
+}
 
+// Loads the pairing table once; on failure suggestions are just not shown
+async function loadPairings() {
+  if (!pairings) {
+    pairings = fetch('/pairings.json')
+      .then(response => response.ok ? response.json() : { neighbors: {} })
+      .then(data => data.neighbors || {})
+      .catch(() => ({}));
+  }
+  return pairings;
+}
+
+// Sums each neighbour's score over the selected ingredients, so ingredients that go
+// with several of them come first
+async function renderSuggestions() {
+  const container = document.getElementById('ingredientSuggestions');
   if (!container) return;
 
-  if (selectedIngredients.length === 0) {
-    container.innerHTML = '<p class="empty-state">No ingredients selected</p>';
+  if (selection.size === 0) {
+    container.innerHTML = '';
     return;
   }
 
-  container.innerHTML = selectedIngredients.map(ingredient => `
-    <span class="selected-ingredient">
-      ${ingredient}
-      <button onclick="toggleIngredient('${ingredient}')" class="remove-btn">&times;</button>
-    </span>
-  `).join('');
+  const neighbors = await loadPairings();
+  const scores = new Map();
+  selection.values().forEach(ingredient => {
+    (neighbors[ingredient] || []).forEach(([name, score]) => {
+      if (!selection.has(name) && ingredientIds.has(name)) scores.set(name, (scores.get(name) || 0) + score);
+    });
+  });
+  const suggestions = [...scores].sort((a, b) => b[1] - a[1]).slice(0, SUGGESTION_COUNT).map(([name]) => name);
+
+  container.innerHTML = suggestions.length ? `
+    <span class="suggestions-label">Goes well with:</span>
+    ${suggestions.map(name => `
+      <button class="suggestion-chip" data-ingredient-id="${ingredientIds.get(name)}">+ ${name}</button>
+    `).join('')}
+  ` : '';
 }
 
 function clearIngredients() {
-  selectedIngredients = [];
-  updateSelectedIngredientsUI();
-  renderIngredientSelection(document.getElementById('ingredientSearch')?.value || '');
+  selection.clear();
 }
 
 async function generateRecipes() {
-  if (selectedIngredients.length === 0) {
+  if (selection.size === 0) {
     alert('Please select at least one ingredient');
     return;
   }
@@ -277,27 +722,51 @@ async function generateRecipes() {
     const dietaryPreference = document.getElementById('dietaryPreference')?.value || '';
     const allergies = document.getElementById('allergies')?.value || '';
 
-    const response = await fetch('/generate-recipe', {
+    const response = await fetch('/generate-recipe/stream', {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
       body: JSON.stringify({
-        ingredients: selectedIngredients,
+        ingredients: selection.values(),
         dietaryPreference,
-        allergies
+        allergies,
+        fields: LIST_FIELDS
       })
     });
 
-    const data = await response.json();
+    // 503 when the server is shedding load; the body is JSON rather than a stream
+    if (!response.ok) {
+      const retryAfter = response.headers.get('Retry-After');
+      throw new Error(`Request failed: ${response.status}${retryAfter ? `, retry in ${retryAfter}s` : ''}`);
+    }
+
+    let received = 0;
+    let pending = 0;
+    recipeCursor = null;
+    await readRecipeStream(response, frame => {
+      if (frame.type === 'summary') {
+        recipeCursor = frame.nextCursor || null;
+        pending = frame.pending || 0;
+        return;
+      }
+      if (received === 0) {
+        displayRecipes([]);
+        showView('recipes');
+      }
+      appendRecipe(frame.recipe);
+      received++;
+    });
 
-    if (data.recipes && data.recipes.length > 0) {
-      displayRecipes(data.recipes);
-      showView('recipes');
-    } else {
+    if (received === 0) {
       throw new Error('No recipes found');
     }
 
+    updateLoadMoreButton();
+
+    // Recipes that missed the server's deadline come back through the cursor
+    if (pending) loadMoreRecipes();
+
   } catch (error) {
     console.error('Error generating recipes:', error);
     if (recipesContainer) {
@@ -314,11 +783,82 @@ async function generateRecipes() {
   }
 }
 
-function displayRecipes(recipes) {
+// Fetches the next page for the current cursor; the server reuses the cached search
+async function loadMoreRecipes() {
+  if (!recipeCursor) return;
+
+  const loadMoreBtn = document.getElementById('loadMoreRecipes');
+  if (loadMoreBtn) {
+    loadMoreBtn.disabled = true;
+    loadMoreBtn.textContent = 'Loading...';
+  }
+
+  try {
+    const response = await fetch(`/generate-recipe/more?cursor=${encodeURIComponent(recipeCursor)}&fields=${LIST_FIELDS.join(',')}`);
+    const data = await response.json();
+    if (!response.ok) throw new Error(data.error || `Request failed: ${response.status}`);
+
+    (data.recipes || []).forEach(appendRecipe);
+    recipeCursor = data.nextCursor || null;
+  } catch (error) {
+    console.error('Error loading more recipes:', error);
+  }
+
+  updateLoadMoreButton();
+}
+
+function updateLoadMoreButton() {
   const container = document.getElementById('recipesContainer');
   if (!container) return;
 
-  container.innerHTML = recipes.map(recipe => `
+  const existing = document.getElementById('loadMoreRecipes');
+  if (existing) existing.parentElement.remove();
+
+  if (!recipeCursor) return;
+
+  container.insertAdjacentHTML('beforeend', `
+    <div class="load-more">
+      <button id="loadMoreRecipes" class="btn-secondary">More Recipes 🍽️</button>
+    </div>
+  `);
+  document.getElementById('loadMoreRecipes').addEventListener('click', loadMoreRecipes);
+}
+
+// Reads an NDJSON response, calling onFrame for each parsed line as it arrives
+async function readRecipeStream(response, onFrame) {
+  if (!response.ok) {
+    throw new Error(`Request failed: ${response.status}`);
+  }
+
+  if (!response.body || !response.body.getReader) {
+    const text = await response.text();
+    text.split('\n').filter(Boolean).forEach(line => onFrame(JSON.parse(line)));
+    return;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let newline;
+    while ((newline = buffer.indexOf('\n')) > -1) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      if (line) onFrame(JSON.parse(line));
+    }
+  }
+
+  buffer += decoder.decode();
+  if (buffer.trim()) onFrame(JSON.parse(buffer));
+}
+
+function renderRecipeCard(recipe) {
+  return `
     <div class="recipe-card">
       <div class="recipe-header">
         <h3>${recipe.title}</h3>
@@ -334,23 +874,71 @@ function displayRecipes(recipes) {
         ${recipe.dietary_labels.map(label => `<span class="dietary-label">${label}</span>`).join('')}
       </div>
 
-      <div class="recipe-section">
-        <h4>Ingredients</h4>
-        <ul class="ingredients-list">
-          ${recipe.ingredients.map(ingredient => `<li>${ingredient}</li>`).join('')}
-        </ul>
-      </div>
-
-      <div class="recipe-section">
-        <h4>Instructions</h4>
-        <ol class="instructions-list">
-          ${recipe.instructions.map(instruction => `<li>${instruction}</li>`).join('')}
-        </ol>
-      </div>
+      ${recipe.ingredients ? renderRecipeSections(recipe) : `
+        <details class="recipe-details" data-recipe-id="${recipe.id}">
+          <summary>Ingredients &amp; Instructions</summary>
+          <div class="recipe-details-body">Loading...</div>
+        </details>
+      `}
 
       ${recipe.sourceUrl ? `<a href="${recipe.sourceUrl}" target="_blank" class="recipe-source">View Original Recipe</a>` : ''}
     </div>
-  `).join('');
+  `;
+}
+
+function renderRecipeSections(recipe) {
+  return `
+    <div class="recipe-section">
+      <h4>Ingredients</h4>
+      <ul class="ingredients-list">
+        ${recipe.ingredients.map(ingredient => `<li>${ingredient}</li>`).join('')}
+      </ul>
+    </div>
+
+    <div class="recipe-section">
+      <h4>Instructions</h4>
+      <ol class="instructions-list">
+        ${recipe.instructions.map(instruction => `<li>${instruction}</li>`).join('')}
+      </ol>
+    </div>
+  `;
+}
+
+// Fills a card's details the first time they are opened
+async function loadRecipeDetails(details) {
+  if (details.dataset.loaded) return;
+  details.dataset.loaded = 'true';
+
+  const body = details.querySelector('.recipe-details-body');
+  try {
+    const response = await fetch(`/recipes/${encodeURIComponent(details.dataset.recipeId)}?fields=ingredients,instructions`);
+    const data = await response.json();
+    if (!response.ok) throw new Error(data.error || `Request failed: ${response.status}`);
+    body.innerHTML = renderRecipeSections(data.recipe);
+  } catch (error) {
+    console.error('Error loading recipe details:', error);
+    delete details.dataset.loaded;
+    body.textContent = 'Could not load this recipe. Close and reopen to retry.';
+  }
+}
+
+function displayRecipes(recipes) {
+  const container = document.getElementById('recipesContainer');
+  if (!container) return;
+
+  container.innerHTML = recipes.map(renderRecipeCard).join('');
+}
+
+function appendRecipe(recipe) {
+  const container = document.getElementById('recipesContainer');
+  if (!container) return;
+
+  const loadMore = container.querySelector('.load-more');
+  if (loadMore) {
+    loadMore.insertAdjacentHTML('beforebegin', renderRecipeCard(recipe));
+  } else {
+    container.insertAdjacentHTML('beforeend', renderRecipeCard(recipe));
+  }
 }
 
 // Service Worker Registration
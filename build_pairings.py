@@ -0,0 +1,197 @@
+"""Build the ingredient pairing table used for "goes well with" suggestions.
+
+Matches the ingredient lines of a recipe corpus against the ingredient catalog in
+app.js, counts how often catalog entries occur together, and keeps the top-k
+neighbours of each entry by normalised PMI. The result is a small JSON table the
+client looks up per selected ingredient, instead of scanning recipes at runtime.
+
+Usage:
+    python build_pairings.py                      # bundled local-recipes.json
+    python build_pairings.py --cache-dir /tmp/smarty-chef-cache --corpus more.json
+
+Only the standard library is needed.
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import re
+from collections import Counter
+from itertools import combinations
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(ROOT, 'smarty-chef-pcs-final')
+
+# Bracketed qualifiers that never match on their own ("Onion (Red)" must not match every
+# "red ..." line, while "Cumin Seeds (Jeera)" may match "jeera"); shared with ranking.js
+with open(os.path.join(APP_DIR, 'ingredient-names.json'), encoding='utf-8') as f:
+    QUALIFIERS = set(json.load(f)['qualifiers'])
+
+
+def load_catalog(app_js):
+    """Ingredient names from the `const ingredients = {...}` block of app.js."""
+    with open(app_js, encoding='utf-8') as f:
+        source = f.read()
+    match = re.search(r'const ingredients = \{(.*?)\n\};', source, re.S)
+    if not match:
+        raise SystemExit(f'No ingredient catalog found in {app_js}')
+    return list(dict.fromkeys(re.findall(r'"([^"]+)"', match.group(1))))
+
+
+def names_for(entry):
+    """Name variants for a catalog entry; keep in step with ranking.js namesFor()."""
+    lower = entry.lower()
+    main = re.sub(r'\(.*?\)', '', lower).strip()
+    inner = re.search(r'\((.*?)\)', lower)
+    alternatives = [a.strip() for a in re.split(r'[,/]', inner.group(1))] if inner else []
+    alternatives = [a for a in alternatives if a]
+    names = [main] + [f'{alt} {main}' for alt in alternatives]
+    names += [alt for alt in alternatives if alt not in QUALIFIERS]
+    return [n for n in dict.fromkeys(names) if n]
+
+
+def compile_matchers(catalog):
+    matchers = []
+    for entry in catalog:
+        variants = sorted(names_for(entry), key=len, reverse=True)
+        pattern = r'\b(' + '|'.join(re.escape(v) for v in variants) + r')(?:e?s)?\b'
+        matchers.append((entry, re.compile(pattern)))
+    return matchers
+
+
+# "2 cloves garlic" is garlic, not the spice
+GARLIC_CLOVES = re.compile(r'\bcloves?\s+(?:of\s+)?garlic\b|\bgarlic\s+cloves?\b')
+
+
+def match_line(line, matchers):
+    """Catalog entries in one ingredient line. An entry whose matched text lies inside a
+    longer match is dropped, so "red onion" counts as Onion (Red) and not Onion (Yellow).
+    When several entries match the same text ("3 eggs" for every Egg (...) variant), only
+    a plain catalog name without brackets is credited, and otherwise none of them."""
+    line = GARLIC_CLOVES.sub('garlic', line)
+    found = []
+    for entry, matcher in matchers:
+        m = matcher.search(line)
+        if m:
+            found.append((entry, m.start(), m.end()))
+
+    by_span = {}
+    for entry, start, end in found:
+        if not any(s <= start and end <= e and (e - s) > (end - start) for _, s, e in found):
+            by_span.setdefault((start, end), []).append(entry)
+
+    present = set()
+    for entries in by_span.values():
+        plain = [entry for entry in entries if '(' not in entry]
+        if len(entries) == 1:
+            present.add(entries[0])
+        elif plain:
+            present.add(plain[0])
+    return present
+
+
+def related(a, b):
+    """Entries sharing a main name or synonym (Rice (Basmati) and Rice (Brown), Spinach and
+    Palak (Spinach)) are variants of one ingredient, not pairings."""
+    return bool(set(names_for(a)) & set(names_for(b)))
+
+
+def recipe_lines(recipe):
+    if recipe.get('extendedIngredients'):
+        return [i.get('original') or i.get('name') or '' for i in recipe['extendedIngredients']]
+    lines = list(recipe.get('ingredients') or [])
+    lines += recipe.get('mainIngredients') or []
+    return [line if isinstance(line, str) else '' for line in lines]
+
+
+def load_corpus(paths, cache_dir):
+    recipes = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        recipes.extend(data if isinstance(data, list) else data.get('recipes', []))
+
+    # Shared cache entries written by cache.js: {"key", "expiresAt", "value"}
+    if cache_dir:
+        for path in glob.glob(os.path.join(cache_dir, 'detail', '*.json')):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    value = json.load(f).get('value')
+            except (OSError, ValueError):
+                continue
+            # complexSearch results are cached as partial entries (used/missed ingredients only)
+            if isinstance(value, dict) and not value.get('partial'):
+                recipes.append(value)
+
+    # The same recipe can come from several sources
+    unique = {}
+    for recipe in recipes:
+        unique[(recipe.get('title') or '').strip().lower() or id(recipe)] = recipe
+    return list(unique.values())
+
+
+def build_table(catalog, recipes, k, min_count, prior):
+    matchers = compile_matchers(catalog)
+    single = Counter()
+    pairs = Counter()
+    total = 0
+
+    for recipe in recipes:
+        present = set()
+        for line in recipe_lines(recipe):
+            present |= match_line(line.lower(), matchers)
+        if not present:
+            continue
+        total += 1
+        single.update(present)
+        pairs.update(combinations(sorted(present), 2))
+
+    # Normalised PMI in [-1, 1], shrunk towards 0 for pairs seen only a few times
+    neighbors = {}
+    for (a, b), count in pairs.items():
+        if count < min_count:
+            continue
+        p_ab = count / total
+        if p_ab >= 1:
+            continue
+        pmi = math.log(p_ab / ((single[a] / total) * (single[b] / total)))
+        score = pmi / -math.log(p_ab) * count / (count + prior)
+        if score <= 0 or related(a, b):
+            continue
+        neighbors.setdefault(a, []).append((b, score))
+        neighbors.setdefault(b, []).append((a, score))
+
+    table = {}
+    for entry in catalog:
+        ranked = sorted(neighbors.get(entry, []), key=lambda item: (-item[1], item[0]))[:k]
+        if ranked:
+            table[entry] = [[name, round(score, 3)] for name, score in ranked]
+    return table, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--app-js', default=os.path.join(ROOT, 'app.js'))
+    parser.add_argument('--corpus', action='append', default=[],
+                        help='JSON array of recipes (transformRecipe or Spoonacular shape); repeatable')
+    parser.add_argument('--cache-dir', help='CACHE_DIR of the server, to include cached recipe details')
+    parser.add_argument('--output', default=os.path.join(APP_DIR, 'pairings.json'))
+    parser.add_argument('-k', type=int, default=8, help='neighbours kept per ingredient')
+    parser.add_argument('--min-count', type=int, default=1, help='minimum co-occurrences for a pair')
+    parser.add_argument('--prior', type=float, default=1.0, help='shrinkage for rarely seen pairs')
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.app_js)
+    recipes = load_corpus([os.path.join(APP_DIR, 'local-recipes.json')] + args.corpus, args.cache_dir)
+    table, used = build_table(catalog, recipes, args.k, args.min_count, args.prior)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'k': args.k, 'recipes': used, 'neighbors': table}, f, ensure_ascii=False, separators=(',', ':'))
+        f.write('\n')
+    print(f'{len(table)} of {len(catalog)} ingredients have pairings, from {used} recipes -> {args.output}')
+
+
+if __name__ == '__main__':
+    main()
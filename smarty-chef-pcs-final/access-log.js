@@ -0,0 +1,55 @@
+// Sampled, buffered access log in JSON lines.
+//
+// Lines are buffered in memory and appended with fs.promises on a timer or once enough
+// have accumulated, so logging never blocks the event loop on disk I/O. Only one write is
+// in flight at a time; if the disk falls behind, the buffer is capped and further lines
+// are dropped (and counted) rather than growing memory. Errors and server failures are
+// always logged; other requests are kept with probability sampleRate.
+
+const fs = require('fs');
+const path = require('path');
+
+function createAccessLog({ file, sampleRate = 1, flushIntervalMs = 1000, flushLines = 200, maxBuffered = 10000 }) {
+  let buffer = [];
+  let writing = null;
+  const stats = { written: 0, dropped: 0, sampledOut: 0, errors: 0 };
+
+  function log(entry) {
+    if (entry.status < 500 && Math.random() >= sampleRate) {
+      stats.sampledOut++;
+      return;
+    }
+    if (buffer.length >= maxBuffered) {
+      stats.dropped++;
+      return;
+    }
+    buffer.push(JSON.stringify(entry));
+    if (buffer.length >= flushLines) flush();
+  }
+
+  function flush() {
+    if (writing || !buffer.length) return writing || Promise.resolve();
+    const lines = buffer;
+    buffer = [];
+
+    writing = fs.promises.mkdir(path.dirname(file), { recursive: true })
+      .then(() => fs.promises.appendFile(file, lines.join('\n') + '\n'))
+      .then(() => { stats.written += lines.length; })
+      .catch(() => { stats.errors++; })
+      .finally(() => { writing = null; });
+    return writing;
+  }
+
+  // Waits for the in-flight write, then writes whatever is left; used on shutdown
+  async function close() {
+    await flush();
+    await flush();
+  }
+
+  const timer = setInterval(flush, flushIntervalMs);
+  timer.unref();
+
+  return { log, flush, close, stats };
+}
+
+module.exports = { createAccessLog };
@@ -0,0 +1,113 @@
+// Admission control for recipe generation: bounded concurrency with fair queuing.
+//
+// At most `limit` generations run at once. Waiting requests are queued per client and
+// admitted round-robin across clients, so one client sending a burst can't starve the
+// rest, and each client may only hold maxQueuePerClient places of the shared queue.
+// Requests are shed straight away when either queue is full, or once they have waited
+// maxWaitMs. With a target latency the limit adapts (AIMD): it grows by one while
+// requests finish under target and the limit is being used, and shrinks by 10% when the
+// smoothed latency goes over, so the concurrency tracks what upstream can sustain.
+
+class OverloadedError extends Error {
+  constructor(reason, retryAfterSeconds) {
+    super(reason === 'timeout' ? 'Timed out waiting for capacity' : 'Server is at capacity');
+    this.reason = reason;
+    this.retryAfterSeconds = retryAfterSeconds;
+  }
+}
+
+function createAdmissionController({ maxConcurrent = 32, minConcurrent = 4, maxQueue = 100, maxQueuePerClient = 10, maxWaitMs = 5000, targetLatencyMs = 0 } = {}) {
+  let limit = maxConcurrent;
+  let inFlight = 0;
+  let queued = 0;
+  let latencyMs = null;
+  const queues = new Map(); // client -> FIFO of waiters, in round-robin order
+  const stats = { admitted: 0, queuedTotal: 0, rejected: { queue_full: 0, client_queue_full: 0, timeout: 0 } };
+
+  function retryAfterSeconds() {
+    const perRequest = latencyMs || 1000;
+    return Math.max(1, Math.ceil((queued / Math.max(1, limit) + 1) * perRequest / 1000));
+  }
+
+  function adjust(durationMs) {
+    latencyMs = latencyMs === null ? durationMs : latencyMs * 0.8 + durationMs * 0.2;
+    if (!targetLatencyMs) return;
+    if (latencyMs > targetLatencyMs) {
+      limit = Math.max(minConcurrent, Math.floor(limit * 0.9));
+    } else if (inFlight + 1 >= limit) {
+      limit = Math.min(maxConcurrent, limit + 1);
+    }
+  }
+
+  // Hands a free slot to the next waiting client, rotating that client to the back
+  function drain() {
+    while (inFlight < limit && queues.size) {
+      const [client, waiters] = queues.entries().next().value;
+      queues.delete(client);
+      const waiter = waiters.shift();
+      if (waiters.length) queues.set(client, waiters);
+      queued--;
+      clearTimeout(waiter.timer);
+      waiter.admit();
+    }
+  }
+
+  function grant() {
+    inFlight++;
+    stats.admitted++;
+    const startedAt = Date.now();
+    let released = false;
+    return () => {
+      if (released) return;
+      released = true;
+      inFlight--;
+      adjust(Date.now() - startedAt);
+      drain();
+    };
+  }
+
+  // Resolves with a release function once the request may run; rejects with an
+  // OverloadedError when it is shed
+  function acquire(client) {
+    if (inFlight < limit && !queued) return Promise.resolve(grant());
+
+    const reason = queued >= maxQueue ? 'queue_full'
+      : (queues.get(client) || []).length >= maxQueuePerClient ? 'client_queue_full'
+      : null;
+    if (reason) {
+      stats.rejected[reason]++;
+      return Promise.reject(new OverloadedError(reason, retryAfterSeconds()));
+    }
+
+    return new Promise((resolve, reject) => {
+      const waiter = {
+        admit: () => resolve(grant()),
+        timer: setTimeout(() => {
+          const waiters = queues.get(client);
+          const index = waiters ? waiters.indexOf(waiter) : -1;
+          if (index === -1) return;
+          waiters.splice(index, 1);
+          if (!waiters.length) queues.delete(client);
+          queued--;
+          stats.rejected.timeout++;
+          reject(new OverloadedError('timeout', retryAfterSeconds()));
+        }, maxWaitMs)
+      };
+      if (!queues.has(client)) queues.set(client, []);
+      queues.get(client).push(waiter);
+      queued++;
+      stats.queuedTotal++;
+    });
+  }
+
+  return {
+    acquire,
+    stats,
+    get limit() { return limit; },
+    get inFlight() { return inFlight; },
+    get queued() { return queued; },
+    get latencyMs() { return latencyMs; }
+  };
+}
+
+module.exports = { createAdmissionController, OverloadedError };
@@ -0,0 +1,219 @@
+// Allergen matching for the recipe filters.
+//
+// A comma-separated allergy list is expanded through ALLERGEN_GROUPS ("nuts" becomes
+// almond, cashew, walnut, peanut, ...) and compiled into one Aho-Corasick automaton, so
+// each recipe's text is scanned once regardless of how many terms the user entered.
+// Terms match anywhere in a word, so "egg" catches "eggnog" and "nut" catches "peanuts";
+// a missed allergen is worse than a lost recipe. Compound words that contain a term but
+// are safe ("eggplant", "nutmeg", "butternut") are listed per group as exceptions.
+
+// Each group lists the words a user may type for it (aliases; one alias may name several
+// groups), the ingredient terms it expands to, words and phrases that contain a term but
+// are safe for the group (except), and the matching Spoonacular complexSearch intolerance.
+const ALLERGEN_GROUPS = {
+  'tree nuts': {
+    aliases: ['tree nut', 'tree nuts', 'nut', 'nuts'],
+    terms: [
+      'nut', 'almond', 'cashew', 'walnut', 'pecan', 'pistachio', 'hazelnut', 'filbert',
+      'macadamia', 'brazil nut', 'pine nut', 'pignoli', 'chestnut', 'praline', 'marzipan',
+      'frangipane', 'nutella', 'gianduja', 'badam', 'kaju', 'akhrot'
+    ],
+    except: [
+      'water chestnut', 'nut-free', 'nut free', 'nutmeg', 'butternut', 'coconut', 'doughnut',
+      'donut', 'nutrition', 'nutrient', 'minute', 'peanut', 'groundnut', 'monkey nut'
+    ],
+    intolerance: 'tree nut'
+  },
+  peanuts: {
+    aliases: ['peanut', 'peanuts', 'groundnut', 'groundnuts', 'nut', 'nuts'],
+    terms: ['peanut', 'groundnut', 'monkey nut', 'arachis'],
+    except: [],
+    intolerance: 'peanut'
+  },
+  dairy: {
+    aliases: ['dairy', 'milk', 'lactose'],
+    terms: [
+      'milk', 'butter', 'cream', 'cheese', 'yogurt', 'yoghurt', 'curd', 'whey', 'casein',
+      'lactose', 'ghee', 'paneer', 'khoya', 'mawa', 'chhena', 'dahi', 'malai', 'lassi',
+      'kefir', 'buttermilk', 'ricotta', 'mozzarella', 'parmesan', 'cheddar', 'feta',
+      'mascarpone', 'burrata', 'brie', 'camembert', 'gruyere', 'gruyère', 'halloumi',
+      'custard', 'ice cream'
+    ],
+    except: [
+      'peanut butter', 'cocoa butter', 'nut butter', 'almond butter', 'cashew butter',
+      'coconut milk', 'coconut cream', 'almond milk', 'soy milk', 'oat milk', 'rice milk',
+      'cashew milk', 'cream of tartar', 'dairy-free', 'dairy free', 'bean curd', 'butternut',
+      'butter bean', 'butterfly', 'butterflied', 'custard apple'
+    ],
+    intolerance: 'dairy'
+  },
+  gluten: {
+    aliases: ['gluten', 'wheat', 'celiac', 'coeliac'],
+    terms: [
+      'gluten', 'wheat', 'flour', 'barley', 'rye', 'spelt', 'farro', 'bulgur', 'couscous',
+      'semolina', 'durum', 'seitan', 'malt', 'bread', 'breadcrumbs', 'panko', 'pasta',
+      'noodle', 'atta', 'maida', 'suji', 'rava', 'dalia', 'sevai', 'vermicelli',
+      'triticale', 'kamut', 'einkorn'
+    ],
+    except: [
+      'rice flour', 'almond flour', 'coconut flour', 'corn flour', 'chickpea flour',
+      'gram flour', 'buckwheat flour', 'tapioca flour', 'jowar flour', 'bajra flour',
+      'ragi flour', 'rice noodle', 'rice vermicelli', 'rice pasta', 'gluten-free', 'gluten free',
+      'cornflour', 'buckwheat', 'breadfruit', 'matta'
+    ],
+    intolerance: 'gluten'
+  },
+  shellfish: {
+    aliases: ['shellfish', 'crustacean', 'crustaceans', 'mollusc', 'molluscs', 'mollusk', 'mollusks', 'seafood'],
+    terms: [
+      'shellfish', 'shrimp', 'prawn', 'lobster', 'crab', 'crayfish', 'crawfish', 'langoustine',
+      'scampi', 'krill', 'scallop', 'clam', 'mussel', 'oyster', 'squid', 'calamari',
+      'octopus', 'cuttlefish'
+    ],
+    except: ['crab apple', 'oyster mushroom'],
+    intolerance: 'shellfish'
+  },
+  egg: {
+    aliases: ['egg', 'eggs'],
+    terms: ['egg', 'mayonnaise', 'mayo', 'meringue', 'albumen', 'aioli'],
+    except: ['egg-free', 'egg free', 'eggplant', 'veggie'],
+    intolerance: 'egg'
+  },
+  fish: {
+    aliases: ['fish', 'seafood'],
+    terms: [
+      'fish', 'salmon', 'tuna', 'cod', 'anchovy', 'anchovies', 'sardine', 'mackerel',
+      'tilapia', 'trout', 'haddock', 'halibut', 'hilsa', 'rohu', 'surmai', 'eel', 'shark',
+      'worcestershire'
+    ],
+    except: ['peel', 'steel', 'wheel'],
+    intolerance: 'seafood'
+  },
+  soy: {
+    aliases: ['soy', 'soya', 'soybean', 'soybeans'],
+    terms: ['soy', 'soya', 'soybean', 'tofu', 'tempeh', 'edamame', 'miso', 'tamari', 'shoyu'],
+    except: ['tamarind'],
+    intolerance: 'soy'
+  },
+  sesame: {
+    aliases: ['sesame'],
+    terms: ['sesame', 'tahini', 'gingelly'],
+    except: [],
+    intolerance: 'sesame'
+  }
+};
+
+const GROUPS_BY_ALIAS = new Map();
+Object.entries(ALLERGEN_GROUPS).forEach(([group, { aliases }]) => {
+  [group, ...aliases].forEach(alias => {
+    if (!GROUPS_BY_ALIAS.has(alias)) GROUPS_BY_ALIAS.set(alias, []);
+    if (!GROUPS_BY_ALIAS.get(alias).includes(group)) GROUPS_BY_ALIAS.get(alias).push(group);
+  });
+});
+
+// Splits an allergy list into taxonomy groups and free-text terms the table doesn't know
+function resolveAllergens(allergies) {
+  const list = Array.isArray(allergies) ? allergies : String(allergies || '').split(',');
+  const groups = new Set();
+  const terms = new Set();
+
+  list.map(a => a.trim().toLowerCase()).filter(Boolean).forEach(allergy => {
+    if (GROUPS_BY_ALIAS.has(allergy)) {
+      GROUPS_BY_ALIAS.get(allergy).forEach(group => groups.add(group));
+    } else {
+      terms.add(allergy);
+    }
+  });
+
+  return { groups: [...groups], terms: [...terms] };
+}
+
+// Builds the trie, failure links and merged outputs for a list of { text } patterns
+function buildAutomaton(patterns) {
+  const nodes = [{ next: new Map(), fail: 0, out: [] }];
+
+  patterns.forEach((pattern, index) => {
+    let state = 0;
+    for (const ch of pattern.text) {
+      let target = nodes[state].next.get(ch);
+      if (target === undefined) {
+        target = nodes.length;
+        nodes.push({ next: new Map(), fail: 0, out: [] });
+        nodes[state].next.set(ch, target);
+      }
+      state = target;
+    }
+    nodes[state].out.push(index);
+  });
+
+  const queue = [...nodes[0].next.values()];
+  for (let head = 0; head < queue.length; head++) {
+    const state = queue[head];
+    nodes[state].next.forEach((target, ch) => {
+      let fail = nodes[state].fail;
+      while (fail && !nodes[fail].next.has(ch)) fail = nodes[fail].fail;
+      const candidate = nodes[fail].next.get(ch);
+      nodes[target].fail = candidate !== undefined && candidate !== target ? candidate : 0;
+      nodes[target].out = nodes[target].out.concat(nodes[nodes[target].fail].out);
+      queue.push(target);
+    });
+  }
+
+  return nodes;
+}
+
+// Compiles an allergy list (comma-separated string or array) into a matcher.
+// findAllergens(text) returns the matched terms; matches(text) is the boolean form.
+function compileAllergenMatcher(allergies) {
+  const { groups, terms } = resolveAllergens(allergies);
+  const patterns = [];
+
+  groups.forEach(group => {
+    ALLERGEN_GROUPS[group].terms.forEach(text => patterns.push({ text, group, mask: false }));
+    ALLERGEN_GROUPS[group].except.forEach(text => patterns.push({ text, group, mask: true }));
+  });
+  terms.forEach(text => patterns.push({ text, group: text, mask: false }));
+
+  const nodes = buildAutomaton(patterns);
+
+  function findAllergens(text) {
+    if (!patterns.length || !text) return [];
+
+    const hits = [];
+    const masks = [];
+    let state = 0;
+
+    for (let i = 0; i < text.length; i++) {
+      let ch = text[i];
+      const code = text.charCodeAt(i);
+      if (code >= 65 && code <= 90) ch = String.fromCharCode(code + 32);
+      else if (code >= 128) ch = ch.toLowerCase();
+
+      while (state && !nodes[state].next.has(ch)) state = nodes[state].fail;
+      state = nodes[state].next.get(ch) || 0;
+
+      const out = nodes[state].out;
+      for (let k = 0; k < out.length; k++) {
+        const pattern = patterns[out[k]];
+        const start = i - pattern.text.length + 1;
+        (pattern.mask ? masks : hits).push({ start, end: i, pattern });
+      }
+    }
+
+    return hits
+      .filter(hit => !masks.some(mask =>
+        mask.pattern.group === hit.pattern.group && mask.start <= hit.start && mask.end >= hit.end
+      ))
+      .map(hit => hit.pattern.text);
+  }
+
+  return {
+    groups,
+    terms,
+    isEmpty: patterns.length === 0,
+    findAllergens,
+    matches: (text) => findAllergens(text).length > 0
+  };
+}
+
+module.exports = { ALLERGEN_GROUPS, resolveAllergens, compileAllergenMatcher };
@@ -0,0 +1,65 @@
+// Background connectivity probe for /api-status.
+//
+// The probe runs on a jittered schedule instead of once per request, so monitoring can
+// poll /api-status as often as it likes without spending Spoonacular quota. Consecutive
+// failures back off exponentially up to maxIntervalMs so an outage or an exhausted quota
+// isn't hammered. Results can also be fed in with record(), which is how cluster workers
+// receive the primary's probe results.
+
+function createBackgroundProbe(run, { intervalMs = 5 * 60 * 1000, maxIntervalMs = 30 * 60 * 1000, jitter = 0.2, historySize = 20 } = {}) {
+  const history = [];
+  let last = null;
+  let consecutiveFailures = 0;
+  let timer = null;
+  let nextRunAt = null;
+  const listeners = [];
+
+  function record(result) {
+    last = result;
+    history.push({ timestamp: result.timestamp, ok: result.ok, statusCode: result.statusCode, latencyMs: result.latencyMs });
+    if (history.length > historySize) history.shift();
+    consecutiveFailures = result.ok ? 0 : consecutiveFailures + 1;
+    listeners.forEach(fn => fn(result));
+  }
+
+  function nextDelay() {
+    const base = Math.min(intervalMs * 2 ** consecutiveFailures, maxIntervalMs);
+    return Math.round(base * (1 + jitter * (2 * Math.random() - 1)));
+  }
+
+  async function tick() {
+    const startedAt = Date.now();
+    let result;
+    try {
+      result = await run();
+    } catch (err) {
+      result = { ok: false, error: err.message };
+    }
+    record({ ...result, timestamp: new Date(startedAt).toISOString(), latencyMs: Date.now() - startedAt });
+    schedule(nextDelay());
+  }
+
+  function schedule(delay) {
+    clearTimeout(timer);
+    nextRunAt = Date.now() + delay;
+    timer = setTimeout(tick, delay);
+    timer.unref();
+  }
+
+  return {
+    // First probe runs after a short random delay so restarted fleets don't probe in lockstep
+    start: () => schedule(Math.round(Math.random() * 2000)),
+    stop: () => clearTimeout(timer),
+    record,
+    onResult: (fn) => listeners.push(fn),
+    snapshot: () => ({
+      last,
+      ageMs: last ? Date.now() - Date.parse(last.timestamp) : null,
+      consecutiveFailures,
+      nextProbeInMs: nextRunAt ? Math.max(0, nextRunAt - Date.now()) : null,
+      history: [...history]
+    })
+  };
+}
+
+module.exports = { createBackgroundProbe };
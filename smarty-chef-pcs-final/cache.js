@@ -0,0 +1,156 @@
+// Caches for Spoonacular search and detail results.
+//
+// createCache is an in-memory TTL cache with LRU eviction; Map insertion order doubles as
+// recency order, since reads re-insert the entry at the end. createSharedCache puts an
+// on-disk tier behind it that every cluster worker reads and writes, so adding workers
+// doesn't split the hit ratio.
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+function createCache({ maxEntries = 500, ttlMs = 30 * 60 * 1000 } = {}) {
+  const entries = new Map();
+  const stats = { hits: 0, misses: 0, sets: 0, evictions: 0 };
+
+  function get(key) {
+    const entry = entries.get(key);
+    if (!entry) {
+      stats.misses++;
+      return undefined;
+    }
+    if (entry.expiresAt <= Date.now()) {
+      entries.delete(key);
+      stats.misses++;
+      return undefined;
+    }
+    entries.delete(key);
+    entries.set(key, entry);
+    stats.hits++;
+    return entry.value;
+  }
+
+  function set(key, value, ttl = ttlMs) {
+    entries.delete(key);
+    entries.set(key, { value, expiresAt: Date.now() + ttl });
+    stats.sets++;
+    while (entries.size > maxEntries) {
+      entries.delete(entries.keys().next().value);
+      stats.evictions++;
+    }
+    return value;
+  }
+
+  // Reads without touching recency or stats, for opportunistic lookups like ranking hints
+  function peek(key) {
+    const entry = entries.get(key);
+    return entry && entry.expiresAt > Date.now() ? entry.value : undefined;
+  }
+
+  return {
+    get,
+    set,
+    peek,
+    delete: (key) => entries.delete(key),
+    clear: () => entries.clear(),
+    get size() { return entries.size; },
+    stats
+  };
+}
+
+// Two-tier cache: the worker's in-memory LRU in front of one JSON file per key under
+// dir/name. get and set are async; with no dir it degrades to the in-memory tier alone.
+function createSharedCache({ name, dir, maxEntries = 500, ttlMs = 30 * 60 * 1000 }) {
+  const local = createCache({ maxEntries, ttlMs });
+  const stats = { hits: 0, misses: 0, sharedHits: 0, sets: 0, errors: 0 };
+  const namespaceDir = dir ? path.join(dir, name) : null;
+
+  if (namespaceDir) fs.mkdirSync(namespaceDir, { recursive: true });
+
+  const fileFor = (key) => path.join(namespaceDir, crypto.createHash('sha1').update(key).digest('hex') + '.json');
+
+  async function get(key) {
+    const value = local.get(key);
+    if (value !== undefined) {
+      stats.hits++;
+      return value;
+    }
+    if (!namespaceDir) {
+      stats.misses++;
+      return undefined;
+    }
+
+    try {
+      const entry = JSON.parse(await fs.promises.readFile(fileFor(key), 'utf8'));
+      const remaining = entry.expiresAt - Date.now();
+      if (entry.key === key && remaining > 0) {
+        local.set(key, entry.value, remaining);
+        stats.hits++;
+        stats.sharedHits++;
+        return entry.value;
+      }
+      if (remaining <= 0) fs.promises.unlink(fileFor(key)).catch(() => {});
+    } catch (err) {
+      if (err.code !== 'ENOENT') stats.errors++;
+    }
+    stats.misses++;
+    return undefined;
+  }
+
+  async function set(key, value, ttl = ttlMs) {
+    local.set(key, value, ttl);
+    stats.sets++;
+    if (!namespaceDir) return value;
+
+    // Write to a temp file and rename, so readers in other workers never see partial JSON
+    const file = fileFor(key);
+    const tmp = `${file}.${process.pid}.${crypto.randomBytes(4).toString('hex')}.tmp`;
+    try {
+      await fs.promises.writeFile(tmp, JSON.stringify({ key, expiresAt: Date.now() + ttl, value }));
+      await fs.promises.rename(tmp, file);
+    } catch {
+      stats.errors++;
+      fs.promises.unlink(tmp).catch(() => {});
+    }
+    return value;
+  }
+
+  return {
+    get,
+    set,
+    peek: local.peek,
+    shared: Boolean(namespaceDir),
+    get size() { return local.size; },
+    stats
+  };
+}
+
+// Deletes expired entries from every namespace under dir; run periodically by one process
+async function pruneCacheDir(dir) {
+  let removed = 0;
+  const namespaces = await fs.promises.readdir(dir, { withFileTypes: true }).catch(() => []);
+
+  for (const namespace of namespaces.filter(d => d.isDirectory())) {
+    const namespaceDir = path.join(dir, namespace.name);
+    const files = await fs.promises.readdir(namespaceDir).catch(() => []);
+    for (const file of files) {
+      const filePath = path.join(namespaceDir, file);
+      try {
+        if (file.endsWith('.tmp')) {
+          const { mtimeMs } = await fs.promises.stat(filePath);
+          if (Date.now() - mtimeMs < 60 * 1000) continue;
+        } else {
+          const { expiresAt } = JSON.parse(await fs.promises.readFile(filePath, 'utf8'));
+          if (expiresAt > Date.now()) continue;
+        }
+        await fs.promises.unlink(filePath);
+        removed++;
+      } catch {
+        // Already removed by another process, or unreadable; leave it for the next pass
+      }
+    }
+  }
+  return removed;
+}
+
+module.exports = { createCache, createSharedCache, pruneCacheDir };
@@ -0,0 +1,112 @@
+// Subset/superset-aware reuse of findByIngredients candidate sets.
+//
+// Selections grow one ingredient at a time, so an exact-match search cache misses on every
+// change. Each searched ingredient set is kept here with its candidates' full ingredient
+// lists (used + missed), indexed by ingredient. A new query is planned from cached sets that
+// are subsets or supersets of it: a superset already searched with every selected
+// ingredient, and subsets each cover their own ingredients, leaving only the uncovered
+// ones to search upstream. Merged candidates are then re-scored against the whole
+// selection, since "used" and "missed" depend on what was selected. The index is kept per
+// process; cluster workers each build their own.
+
+const { createCache } = require('./cache');
+const { compileSelection, popcount } = require('./ranking');
+
+// Keeps what ranking needs from a findByIngredients item: its ID, likes and ingredient names
+function compactCandidate(candidate) {
+  return {
+    id: candidate.id,
+    likes: candidate.likes || 0,
+    ingredients: [...(candidate.usedIngredients || []), ...(candidate.missedIngredients || [])]
+      .map(i => String(i.name || i.original || '').toLowerCase())
+      .filter(Boolean)
+  };
+}
+
+// Rebuilds used/missed ingredients for a selection, in the shape rankCandidates expects
+function rescoreCandidates(candidates, ingredients) {
+  const selection = compileSelection(ingredients);
+  return candidates.map(({ id, likes, ingredients: names }) => {
+    const used = names.filter(name => popcount(selection.bitsetFor([name])) > 0);
+    return {
+      id,
+      likes,
+      usedIngredients: used.map(name => ({ name })),
+      usedIngredientCount: used.length,
+      missedIngredientCount: names.length - used.length
+    };
+  });
+}
+
+// ingredients are normalised names (see query-log normalizeQuery)
+function createCandidateIndex({ maxEntries = 500, ttlMs = 30 * 60 * 1000 } = {}) {
+  const entries = createCache({ maxEntries, ttlMs });
+  const byIngredient = new Map();
+
+  function add(ingredients, candidates) {
+    const key = ingredients.join(',');
+    entries.set(key, { ingredients, candidates: candidates.map(compactCandidate) });
+    ingredients.forEach(name => {
+      if (!byIngredient.has(name)) byIngredient.set(name, new Set());
+      byIngredient.get(name).add(key);
+    });
+  }
+
+  // Cached entries sharing at least one ingredient with the query; expired or evicted
+  // entries are dropped from the index as they're found
+  function overlapping(ingredients) {
+    const found = new Map();
+    ingredients.forEach(name => {
+      const keys = byIngredient.get(name);
+      if (!keys) return;
+      keys.forEach(key => {
+        const entry = entries.peek(key);
+        if (entry) found.set(key, entry);
+        else keys.delete(key);
+      });
+      if (!keys.size) byIngredient.delete(name);
+    });
+    return [...found.values()];
+  }
+
+  // Returns the cached candidates usable for the query, which cached sets they came from,
+  // and the ingredients no cached set covers (to be searched upstream)
+  function plan(ingredients) {
+    const wanted = new Set(ingredients);
+    const related = overlapping(ingredients);
+
+    const superset = related
+      .filter(entry => ingredients.every(name => entry.ingredients.includes(name)))
+      .sort((a, b) => a.ingredients.length - b.ingredients.length)[0];
+    if (superset) {
+      return { candidates: superset.candidates, sources: [superset.ingredients], missing: [] };
+    }
+
+    // Greedy cover with subsets: largest uncovered contribution first
+    const subsets = related.filter(entry => entry.ingredients.every(name => wanted.has(name)));
+    const uncovered = new Set(ingredients);
+    const chosen = [];
+    while (uncovered.size) {
+      let best = null;
+      let bestGain = 0;
+      subsets.forEach(entry => {
+        const gain = entry.ingredients.filter(name => uncovered.has(name)).length;
+        if (gain > bestGain) {
+          best = entry;
+          bestGain = gain;
+        }
+      });
+      if (!best) break;
+      chosen.push(best);
+      best.ingredients.forEach(name => uncovered.delete(name));
+    }
+
+    const candidates = new Map();
+    chosen.forEach(entry => entry.candidates.forEach(c => candidates.set(c.id, c)));
+    return { candidates: [...candidates.values()], sources: chosen.map(entry => entry.ingredients), missing: [...uncovered] };
+  }
+
+  return { add, plan, get size() { return entries.size; } };
+}
+
+module.exports = { createCandidateIndex, compactCandidate, rescoreCandidates };
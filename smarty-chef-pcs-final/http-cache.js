@@ -0,0 +1,196 @@
+// Compression, strong ETags and Cache-Control for static assets and JSON responses.
+//
+// Built on zlib rather than the compression package, so representations can be hashed and
+// cached: each static file is read, hashed and compressed once per mtime. Precompressed
+// siblings (app.js.br, app.js.gz) are preferred over on-the-fly compression when present.
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const util = require('util');
+const zlib = require('zlib');
+const { timed, timedSync } = require('./server-timing');
+const msgpack = require('./msgpack');
+
+const brotliCompress = util.promisify(zlib.brotliCompress);
+const gzip = util.promisify(zlib.gzip);
+
+const COMPRESSIBLE_TYPES = /^(text\/|application\/(javascript|json|manifest\+json|xml|x-ndjson)|image\/svg\+xml)/;
+const PRECOMPRESSED_EXTENSIONS = { br: '.br', gzip: '.gz' };
+const MIN_COMPRESS_BYTES = 1024;
+
+// app.3f9a1c2b.js, style.9f86d081884c7d65.css: content-addressed, safe to cache forever
+const FINGERPRINTED = /\.[0-9a-f]{8,}\.[a-z0-9]+$/i;
+
+function hashBody(buffer) {
+  return crypto.createHash('sha1').update(buffer).digest('base64url');
+}
+
+// Picks br or gzip from Accept-Encoding, honouring q=0 exclusions
+function negotiateEncoding(req) {
+  const header = String(req.headers['accept-encoding'] || '');
+  const accepted = new Map();
+  header.split(',').forEach(part => {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.map(p => p.trim()).find(p => p.startsWith('q='));
+    if (name) accepted.set(name, q ? parseFloat(q.slice(2)) : 1);
+  });
+
+  if (accepted.get('br') > 0) return 'br';
+  if (accepted.get('gzip') > 0) return 'gzip';
+  return null;
+}
+
+// True when Accept lists MessagePack (application/msgpack or application/x-msgpack) with q > 0
+function acceptsMsgpack(req) {
+  return String(req.headers.accept || '').split(',').some(part => {
+    const [type, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.map(p => p.trim()).find(p => p.startsWith('q='));
+    return (type === 'application/msgpack' || type === 'application/x-msgpack') && (!q || parseFloat(q.slice(2)) > 0);
+  });
+}
+
+function ifNoneMatch(req, etag) {
+  const header = req.headers['if-none-match'];
+  if (!header) return false;
+  if (header.trim() === '*') return true;
+  return header.split(',').some(tag => tag.trim().replace(/^W\//, '') === etag);
+}
+
+function compress(buffer, encoding) {
+  return encoding === 'br'
+    ? brotliCompress(buffer, { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 5 } })
+    : gzip(buffer, { level: 6 });
+}
+
+// Static file server with strong content-hash ETags. maxAge (seconds) sets Cache-Control
+// for ordinary files; fingerprinted files get a year plus immutable, and the service
+// worker is always revalidated so updates reach installed PWAs.
+function serveStatic(root, { maxAge = 0 } = {}) {
+  const rootDir = path.resolve(root);
+  const files = new Map();
+
+  async function readExisting(filePath) {
+    try {
+      return await fs.promises.readFile(filePath);
+    } catch {
+      return null;
+    }
+  }
+
+  async function loadFile(filePath, stat) {
+    const cached = files.get(filePath);
+    if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) return cached;
+
+    const body = await fs.promises.readFile(filePath);
+    const entry = { mtimeMs: stat.mtimeMs, size: stat.size, body, hash: hashBody(body), variants: new Map() };
+
+    for (const [encoding, ext] of Object.entries(PRECOMPRESSED_EXTENSIONS)) {
+      const precompressed = await readExisting(filePath + ext);
+      if (precompressed) entry.variants.set(encoding, precompressed);
+    }
+
+    files.set(filePath, entry);
+    return entry;
+  }
+
+  function cacheControlFor(filePath) {
+    if (path.basename(filePath) === 'service-worker.js') return 'no-cache';
+    if (FINGERPRINTED.test(filePath)) return 'public, max-age=31536000, immutable';
+    return maxAge > 0 ? `public, max-age=${maxAge}` : 'public, max-age=0, must-revalidate';
+  }
+
+  return async (req, res, next) => {
+    if (req.method !== 'GET' && req.method !== 'HEAD') return next();
+
+    let relative;
+    try {
+      relative = decodeURIComponent(req.path);
+    } catch {
+      return next();
+    }
+    if (relative.endsWith('/')) relative += 'index.html';
+    // Like express.static's default, never serve dotfiles (.data holds the query log)
+    if (relative.split('/').some(segment => segment.startsWith('.'))) return next();
+
+    const filePath = path.join(rootDir, path.normalize(relative));
+    if (!filePath.startsWith(rootDir + path.sep)) return next();
+
+    try {
+      const stat = await fs.promises.stat(filePath);
+      if (!stat.isFile()) return next();
+
+      const entry = await loadFile(filePath, stat);
+      res.type(path.extname(filePath));
+      const type = res.get('Content-Type') || '';
+
+      let encoding = negotiateEncoding(req);
+      if (encoding && !entry.variants.has(encoding)) {
+        if (COMPRESSIBLE_TYPES.test(type) && entry.size >= MIN_COMPRESS_BYTES) {
+          entry.variants.set(encoding, await compress(entry.body, encoding));
+        } else {
+          encoding = null;
+        }
+      }
+
+      const body = encoding ? entry.variants.get(encoding) : entry.body;
+      const etag = `"${entry.hash}${encoding ? '-' + encoding : ''}"`;
+
+      res.set({
+        ETag: etag,
+        'Cache-Control': cacheControlFor(filePath),
+        'Last-Modified': new Date(entry.mtimeMs).toUTCString()
+      });
+      res.vary('Accept-Encoding');
+      if (encoding) res.set('Content-Encoding', encoding);
+
+      if (ifNoneMatch(req, etag)) {
+        return res.status(304).end();
+      }
+
+      res.set('Content-Length', String(body.length));
+      res.status(200).end(req.method === 'HEAD' ? undefined : body);
+    } catch (err) {
+      if (err.code === 'ENOENT' || err.code === 'ENOTDIR') return next();
+      next(err);
+    }
+  };
+}
+
+// Replaces res.json with a version that sets a strong ETag, answers a matching
+// If-None-Match with 304 (POST included, so clients can revalidate a generate-recipe
+// result) and compresses bodies above MIN_COMPRESS_BYTES. Clients that Accept
+// application/msgpack get the same data MessagePack-encoded.
+function jsonResponses() {
+  return (req, res, next) => {
+    res.json = (data) => {
+      const binary = acceptsMsgpack(req);
+      const payload = timedSync('serialize', () => binary ? msgpack.encode(data) : Buffer.from(JSON.stringify(data)));
+      const encoding = payload.length >= MIN_COMPRESS_BYTES ? negotiateEncoding(req) : null;
+      const etag = `"${hashBody(payload)}${binary ? '-mp' : ''}${encoding ? '-' + encoding : ''}"`;
+
+      if (binary) res.type('application/msgpack');
+      else if (!res.get('Content-Type')) res.type('application/json; charset=utf-8');
+      res.set('ETag', etag);
+      res.vary('Accept-Encoding');
+      res.vary('Accept');
+
+      if (res.statusCode >= 200 && res.statusCode < 300 && ifNoneMatch(req, etag)) {
+        return res.status(304).end();
+      }
+
+      if (!encoding) return res.send(payload);
+
+      timed('compress', () => compress(payload, encoding))
+        .then(compressed => {
+          res.set('Content-Encoding', encoding);
+          res.send(compressed);
+        })
+        .catch(() => res.send(payload));
+      return res;
+    };
+    next();
+  };
+}
+
+module.exports = { serveStatic, jsonResponses, negotiateEncoding };
@@ -0,0 +1,56 @@
+// HTTP/2 listener for the Express app, and 103 Early Hints for the app shell.
+//
+// Express 4 gives every request its own request/response prototypes, which inherit from
+// http.IncomingMessage and http.ServerResponse. HTTP/2 compatibility objects keep their
+// state behind Http2ServerRequest/Http2ServerResponse getters, so for HTTP/2 requests the
+// app's prototypes are swapped for copies built on those classes while express initialises
+// the request (synchronously, inside app()). Browsers only use HTTP/2 over TLS; without a
+// key and certificate the listener speaks cleartext h2c, for proxies that use it upstream.
+
+const fs = require('fs');
+const http2 = require('http2');
+
+function rebase(object, base) {
+  return Object.create(base, {
+    ...Object.getOwnPropertyDescriptors(Object.getPrototypeOf(object)),
+    ...Object.getOwnPropertyDescriptors(object)
+  });
+}
+
+function createHttp2Server(app, { keyFile, certFile } = {}) {
+  const h2Request = rebase(app.request, http2.Http2ServerRequest.prototype);
+  const h2Response = rebase(app.response, http2.Http2ServerResponse.prototype);
+
+  function handle(req, res) {
+    if (req.httpVersionMajor !== 2) return app(req, res);
+
+    const { request, response } = app;
+    app.request = h2Request;
+    app.response = h2Response;
+    try {
+      app(req, res);
+    } finally {
+      app.request = request;
+      app.response = response;
+    }
+  }
+
+  if (keyFile && certFile) {
+    // allowHTTP1 keeps HTTP/1.1 clients working on the same TLS port
+    return http2.createSecureServer({ key: fs.readFileSync(keyFile), cert: fs.readFileSync(certFile), allowHTTP1: true }, handle);
+  }
+  return http2.createServer(handle);
+}
+
+// Sends 103 Early Hints with the given Link values for GET requests to paths, so the
+// browser starts fetching critical assets while the page itself is being served
+function earlyHints(paths, links) {
+  return (req, res, next) => {
+    if (req.method === 'GET' && paths.includes(req.path) && typeof res.writeEarlyHints === 'function') {
+      res.writeEarlyHints({ link: links });
+    }
+    next();
+  };
+}
+
+module.exports = { createHttp2Server, earlyHints };
@@ -0,0 +1,81 @@
+// Pool of Spoonacular API keys, balanced by remaining daily quota.
+//
+// Each upstream response reports the key's remaining points (X-API-Quota-Left); requests go
+// to the available key with the most left, with keys not yet seen treated as full so each
+// gets probed early, and in-flight requests breaking ties. A 402 means the key's daily
+// points are spent: it cools down until the quota resets at midnight UTC. A 429 is a rate
+// limit: a short cooldown that doubles while the key keeps getting 429s. State is per
+// process; in cluster mode each worker learns quotas from its own responses.
+
+function nextUtcMidnight(now) {
+  const date = new Date(now);
+  return Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate() + 1);
+}
+
+function createKeyPool(keys, { rateLimitCooldownMs = 60 * 1000, maxCooldownMs = 15 * 60 * 1000 } = {}) {
+  const entries = [...new Set(keys.filter(Boolean))].map((key, index) => ({
+    key,
+    name: `key${index + 1}`,
+    quota: null,
+    inFlight: 0,
+    cooldownUntil: 0,
+    cooldownReason: null,
+    rateLimitStrikes: 0,
+    requests: 0
+  }));
+
+  const available = (entry, now) => entry.cooldownUntil <= now;
+  const remaining = (entry) => entry.quota ? entry.quota.left : Infinity;
+
+  // Returns the entry to use, or null when every key is cooling down; exclude skips keys
+  // already tried for this request
+  function acquire(exclude = []) {
+    const now = Date.now();
+    const candidates = entries.filter(entry => available(entry, now) && !exclude.includes(entry));
+    if (!candidates.length) return null;
+
+    const entry = candidates.reduce((best, candidate) =>
+      remaining(candidate) > remaining(best) ||
+      (remaining(candidate) === remaining(best) && candidate.inFlight < best.inFlight) ? candidate : best
+    );
+    entry.inFlight++;
+    entry.requests++;
+    return entry;
+  }
+
+  function release(entry, { status, quota } = {}) {
+    entry.inFlight--;
+    if (quota) entry.quota = quota;
+
+    const now = Date.now();
+    if (status === 402) {
+      entry.cooldownUntil = nextUtcMidnight(now);
+      entry.cooldownReason = 'quota';
+    } else if (status === 429) {
+      entry.rateLimitStrikes++;
+      entry.cooldownUntil = now + Math.min(rateLimitCooldownMs * 2 ** (entry.rateLimitStrikes - 1), maxCooldownMs);
+      entry.cooldownReason = 'rate_limit';
+    } else if (status && status < 400) {
+      entry.rateLimitStrikes = 0;
+    }
+  }
+
+  // Per-key state for /api-status, by position only: no part of a key is ever exposed
+  function snapshot() {
+    const now = Date.now();
+    return entries.map((entry, index) => ({
+      index,
+      name: entry.name,
+      available: available(entry, now),
+      cooldownReason: available(entry, now) ? null : entry.cooldownReason,
+      cooldownRemainingMs: available(entry, now) ? 0 : entry.cooldownUntil - now,
+      quota: entry.quota,
+      inFlight: entry.inFlight,
+      requests: entry.requests
+    }));
+  }
+
+  return { size: entries.length, acquire, release, snapshot };
+}
+
+module.exports = { createKeyPool };
@@ -0,0 +1,72 @@
+// Bundled local recipe corpus with an ingredient index, for offline and hybrid serving.
+//
+// Each recipe in local-recipes.json lists its mainIngredients as plain names ("chickpea",
+// "basmati rice"). Those names are indexed once at startup; a query's catalog selections
+// ("Chickpeas (Garbanzo)", "Rice (Basmati)") expand to the same name variants ranking.js
+// uses, so lookups are a few Map reads per selected ingredient.
+
+const { namesFor } = require('./ranking');
+
+// Singular form used on both sides of the index: tomatoes -> tomato, chickpeas -> chickpea
+function normalizeName(name) {
+  const lower = String(name).toLowerCase().trim();
+  if (lower.endsWith('oes')) return lower.slice(0, -2);
+  if (lower.endsWith('s') && !lower.endsWith('ss')) return lower.slice(0, -1);
+  return lower;
+}
+
+function createLocalCorpus(recipes) {
+  const index = new Map();
+  // Response copies without the index-only field, shaped like transformRecipe output
+  const served = recipes.map(({ mainIngredients, ...recipe }) => recipe);
+
+  recipes.forEach((recipe, position) => {
+    recipe.mainIngredients.forEach(name => {
+      const key = normalizeName(name);
+      if (!index.has(key)) index.set(key, new Set());
+      index.get(key).add(position);
+    });
+  });
+
+  // Exact name matches score 1; a multi-word selection whose last word matches
+  // ("Sweet Potato" -> "potato") scores 0.5
+  function matchesFor(selected) {
+    const scores = new Map();
+    namesFor(selected).forEach(name => {
+      const words = normalizeName(name).split(/\s+/);
+      [[words.join(' '), 1], [words[words.length - 1], 0.5]].forEach(([key, weight]) => {
+        (index.get(key) || []).forEach(position => {
+          scores.set(position, Math.max(scores.get(position) || 0, weight));
+        });
+      });
+    });
+    return scores;
+  }
+
+  // Returns recipes ranked by how much of the selection they use, then by how few of
+  // their own main ingredients are missing, then by healthScore
+  function search(ingredients, limit = Infinity) {
+    const totals = new Map();
+    ingredients.forEach(selected => {
+      matchesFor(selected).forEach((score, position) => {
+        totals.set(position, (totals.get(position) || 0) + score);
+      });
+    });
+
+    return [...totals]
+      .map(([position, score]) => ({ position, recipe: recipes[position], score }))
+      .sort((a, b) =>
+        b.score - a.score ||
+        a.recipe.mainIngredients.length - b.recipe.mainIngredients.length ||
+        b.recipe.healthScore - a.recipe.healthScore
+      )
+      .slice(0, limit)
+      .map(({ position }) => served[position]);
+  }
+
+  const byId = new Map(served.map(recipe => [recipe.id, recipe]));
+
+  return { size: recipes.length, search, get: (id) => byId.get(id) };
+}
+
+module.exports = { createLocalCorpus };
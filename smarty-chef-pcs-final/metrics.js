@@ -0,0 +1,139 @@
+// Minimal Prometheus registry: counters, gauges and histograms rendered in the text
+// exposition format for GET /metrics. Collectors registered with onCollect refresh
+// values derived from other state (cache stats, heap, event-loop lag) at scrape time.
+// Labels set with setDefaultLabels (the cluster worker) are added to every series.
+
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+const DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+const metrics = [];
+const collectors = [];
+let defaultLabelKey = '';
+
+function labelKey(labels = {}) {
+  return Object.keys(labels).sort().map(k => `${k}="${String(labels[k]).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')}"`).join(',');
+}
+
+function formatSample(name, key, value) {
+  const labels = defaultLabelKey && key ? `${defaultLabelKey},${key}` : defaultLabelKey || key;
+  return `${name}${labels ? `{${labels}}` : ''} ${Number.isFinite(value) ? value : 0}`;
+}
+
+function setDefaultLabels(labels) {
+  defaultLabelKey = labelKey(labels);
+}
+
+function counter(name, help) {
+  const values = new Map();
+  const metric = {
+    name, help, type: 'counter',
+    inc(labels, amount = 1) {
+      const key = labelKey(labels);
+      values.set(key, (values.get(key) || 0) + amount);
+    },
+    set(labels, value) {
+      values.set(labelKey(labels), value);
+    },
+    render: () => [...values].map(([key, value]) => formatSample(name, key, value))
+  };
+  metrics.push(metric);
+  return metric;
+}
+
+function gauge(name, help) {
+  const values = new Map();
+  const metric = {
+    name, help, type: 'gauge',
+    set(labels, value) {
+      values.set(labelKey(labels), value);
+    },
+    inc(labels, amount = 1) {
+      const key = labelKey(labels);
+      values.set(key, (values.get(key) || 0) + amount);
+    },
+    dec(labels, amount = 1) {
+      metric.inc(labels, -amount);
+    },
+    render: () => [...values].map(([key, value]) => formatSample(name, key, value))
+  };
+  metrics.push(metric);
+  return metric;
+}
+
+function histogram(name, help, buckets = DEFAULT_BUCKETS) {
+  const series = new Map();
+  const metric = {
+    name, help, type: 'histogram',
+    observe(labels, value) {
+      const key = labelKey(labels);
+      let s = series.get(key);
+      if (!s) {
+        s = { counts: new Array(buckets.length).fill(0), sum: 0, count: 0 };
+        series.set(key, s);
+      }
+      for (let i = 0; i < buckets.length; i++) {
+        if (value <= buckets[i]) s.counts[i]++;
+      }
+      s.sum += value;
+      s.count++;
+    },
+    // Returns a function that records the elapsed seconds when called
+    startTimer(labels = {}) {
+      const start = process.hrtime.bigint();
+      return (extraLabels = {}) => {
+        const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+        metric.observe({ ...labels, ...extraLabels }, seconds);
+        return seconds;
+      };
+    },
+    render: () => {
+      const lines = [];
+      series.forEach((s, key) => {
+        const prefix = key ? key + ',' : '';
+        buckets.forEach((bound, i) => lines.push(formatSample(`${name}_bucket`, `${prefix}le="${bound}"`, s.counts[i])));
+        lines.push(formatSample(`${name}_bucket`, `${prefix}le="+Inf"`, s.count));
+        lines.push(formatSample(`${name}_sum`, key, s.sum));
+        lines.push(formatSample(`${name}_count`, key, s.count));
+      });
+      return lines;
+    }
+  };
+  metrics.push(metric);
+  return metric;
+}
+
+function onCollect(fn) {
+  collectors.push(fn);
+}
+
+function render() {
+  collectors.forEach(fn => fn());
+  return metrics.map(m => [
+    `# HELP ${m.name} ${m.help}`,
+    `# TYPE ${m.name} ${m.type}`,
+    ...m.render()
+  ].join('\n')).join('\n') + '\n';
+}
+
+// Process-level metrics: event-loop lag percentiles and memory usage
+const eventLoopDelay = monitorEventLoopDelay({ resolution: 20 });
+eventLoopDelay.enable();
+
+const eventLoopLag = gauge('nodejs_eventloop_lag_seconds', 'Event-loop delay since the last scrape, by percentile');
+const heapBytes = gauge('nodejs_heap_bytes', 'V8 heap usage');
+const residentMemory = gauge('process_resident_memory_bytes', 'Resident set size');
+
+onCollect(() => {
+  eventLoopLag.set({ quantile: '0.5' }, eventLoopDelay.percentile(50) / 1e9);
+  eventLoopLag.set({ quantile: '0.99' }, eventLoopDelay.percentile(99) / 1e9);
+  eventLoopLag.set({ quantile: '1' }, eventLoopDelay.max / 1e9);
+  eventLoopDelay.reset();
+
+  const memory = process.memoryUsage();
+  heapBytes.set({ type: 'used' }, memory.heapUsed);
+  heapBytes.set({ type: 'total' }, memory.heapTotal);
+  residentMemory.set({}, memory.rss);
+});
+
+module.exports = { counter, gauge, histogram, onCollect, render, setDefaultLabels };
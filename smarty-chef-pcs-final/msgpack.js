@@ -0,0 +1,83 @@
+// MessagePack encoder for JSON-shaped values, used when a client asks for
+// application/msgpack instead of JSON.
+//
+// Encodes what JSON.stringify would: toJSON() is honoured, undefined and function values
+// are dropped from objects (and become nil in arrays), non-finite numbers become nil.
+// Integers use the smallest int/uint format up to 32 bits; anything else is a float64.
+
+function encode(value) {
+  const chunks = [];
+  write(value, chunks);
+  return Buffer.concat(chunks);
+}
+
+function header(chunks, bytes) {
+  chunks.push(Buffer.from(bytes));
+}
+
+function writeLength(chunks, length, fix, fixMax, code16, code32, code8) {
+  if (length <= fixMax) return header(chunks, [fix | length]);
+  if (code8 !== undefined && length < 0x100) return header(chunks, [code8, length]);
+  if (length < 0x10000) return header(chunks, [code16, length >> 8, length & 0xff]);
+  const buffer = Buffer.alloc(5);
+  buffer[0] = code32;
+  buffer.writeUInt32BE(length, 1);
+  chunks.push(buffer);
+}
+
+function writeNumber(value, chunks) {
+  if (!Number.isFinite(value)) return header(chunks, [0xc0]);
+
+  if (Number.isInteger(value) && value >= -0x80000000 && value <= 0xffffffff) {
+    if (value >= 0) {
+      if (value < 0x80) return header(chunks, [value]);
+      if (value < 0x100) return header(chunks, [0xcc, value]);
+      if (value < 0x10000) return header(chunks, [0xcd, value >> 8, value & 0xff]);
+      const buffer = Buffer.alloc(5);
+      buffer[0] = 0xce;
+      buffer.writeUInt32BE(value, 1);
+      return chunks.push(buffer);
+    }
+    if (value >= -32) return header(chunks, [value & 0xff]);
+    if (value >= -0x80) return header(chunks, [0xd0, value & 0xff]);
+    const buffer = Buffer.alloc(value >= -0x8000 ? 3 : 5);
+    buffer[0] = value >= -0x8000 ? 0xd1 : 0xd2;
+    if (value >= -0x8000) buffer.writeInt16BE(value, 1);
+    else buffer.writeInt32BE(value, 1);
+    return chunks.push(buffer);
+  }
+
+  const buffer = Buffer.alloc(9);
+  buffer[0] = 0xcb;
+  buffer.writeDoubleBE(value, 1);
+  chunks.push(buffer);
+}
+
+function write(value, chunks) {
+  if (value && typeof value.toJSON === 'function') value = value.toJSON();
+
+  if (value === null || value === undefined || typeof value === 'function') return header(chunks, [0xc0]);
+  if (value === false) return header(chunks, [0xc2]);
+  if (value === true) return header(chunks, [0xc3]);
+  if (typeof value === 'number') return writeNumber(value, chunks);
+
+  if (typeof value === 'string') {
+    const bytes = Buffer.from(value, 'utf8');
+    writeLength(chunks, bytes.length, 0xa0, 31, 0xda, 0xdb, 0xd9);
+    return chunks.push(bytes);
+  }
+
+  if (Array.isArray(value)) {
+    writeLength(chunks, value.length, 0x90, 15, 0xdc, 0xdd);
+    return value.forEach(item => write(item, chunks));
+  }
+
+  const entries = Object.entries(value).filter(([, v]) => v !== undefined && typeof v !== 'function');
+  writeLength(chunks, entries.length, 0x80, 15, 0xde, 0xdf);
+  entries.forEach(([key, v]) => {
+    write(key, chunks);
+    write(v, chunks);
+  });
+}
+
+module.exports = { encode };
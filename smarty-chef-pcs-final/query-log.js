@@ -0,0 +1,92 @@
+// Popular-query log used to warm the caches after a deploy or restart.
+//
+// Normalised queries are counted in memory and merged into a JSON file periodically.
+// Each flush re-reads the file and adds only this process's counts since the previous
+// flush, so cluster workers sharing the file don't overwrite each other's totals (a
+// flush racing another can drop one interval's counts, which is fine for popularity).
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+function normalizeQuery({ ingredients = [], dietaryPreference = '', allergies = '' }) {
+  return {
+    ingredients: [...new Set(ingredients.map(i => String(i).trim().toLowerCase()).filter(Boolean))].sort(),
+    dietaryPreference: String(dietaryPreference).trim().toLowerCase(),
+    allergies: String(allergies).split(',').map(a => a.trim().toLowerCase()).filter(Boolean).sort().join(', ')
+  };
+}
+
+function queryKey(query) {
+  const { ingredients, dietaryPreference, allergies } = normalizeQuery(query);
+  return `${ingredients.join(',')}|${dietaryPreference}|${allergies}`;
+}
+
+async function readLog(file) {
+  try {
+    return JSON.parse(await fs.promises.readFile(file, 'utf8'));
+  } catch {
+    return {};
+  }
+}
+
+function createQueryLog({ file, flushIntervalMs = 60 * 1000, maxEntries = 2000 }) {
+  let pending = new Map();
+
+  function record(query) {
+    const normalized = normalizeQuery(query);
+    if (!normalized.ingredients.length) return;
+
+    const key = queryKey(normalized);
+    const entry = pending.get(key) || { query: normalized, count: 0 };
+    entry.count++;
+    entry.lastSeen = Date.now();
+    pending.set(key, entry);
+  }
+
+  async function flush() {
+    if (!pending.size) return;
+    const delta = pending;
+    pending = new Map();
+
+    const log = await readLog(file);
+    delta.forEach((entry, key) => {
+      const existing = log[key];
+      log[key] = {
+        query: entry.query,
+        count: (existing ? existing.count : 0) + entry.count,
+        lastSeen: entry.lastSeen
+      };
+    });
+
+    // Keep the file bounded: drop the least popular, then least recent, entries
+    const kept = Object.entries(log)
+      .sort(([, a], [, b]) => b.count - a.count || b.lastSeen - a.lastSeen)
+      .slice(0, maxEntries);
+
+    const tmp = `${file}.${process.pid}.${crypto.randomBytes(4).toString('hex')}.tmp`;
+    try {
+      await fs.promises.mkdir(path.dirname(file), { recursive: true });
+      await fs.promises.writeFile(tmp, JSON.stringify(Object.fromEntries(kept)));
+      await fs.promises.rename(tmp, file);
+    } catch (err) {
+      fs.promises.unlink(tmp).catch(() => {});
+      console.warn(`⚠️  Could not write query log: ${err.message}`);
+    }
+  }
+
+  async function top(n) {
+    const log = await readLog(file);
+    return Object.values(log)
+      .sort((a, b) => b.count - a.count || b.lastSeen - a.lastSeen)
+      .slice(0, n)
+      .map(entry => entry.query);
+  }
+
+  const timer = setInterval(flush, flushIntervalMs);
+  timer.unref();
+
+  return { record, flush, top };
+}
+
+module.exports = { createQueryLog, normalizeQuery, queryKey };
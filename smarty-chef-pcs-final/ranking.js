@@ -0,0 +1,92 @@
+// Local ranking of findByIngredients candidates, deciding which ones get a detail fetch.
+//
+// The user's selection is numbered once per query and each candidate's used ingredients
+// become a bitset over those numbers, so coverage is a popcount per candidate. The server
+// has no copy of the app.js catalog, so the bit positions are the selected catalog
+// entries of this query rather than global catalog IDs; that's all coverage needs.
+// Quality (spoonacularScore/healthScore) is only known once a recipe has been detailed,
+// so it comes from the detail cache when present and a neutral prior otherwise.
+
+const WEIGHTS = { coverage: 0.5, missed: 0.2, quality: 0.15, health: 0.1, likes: 0.05 };
+const NEUTRAL_SCORE = 50;
+
+function popcount32(x) {
+  x -= (x >>> 1) & 0x55555555;
+  x = (x & 0x33333333) + ((x >>> 2) & 0x33333333);
+  return (((x + (x >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+}
+
+function popcount(words) {
+  let count = 0;
+  for (let i = 0; i < words.length; i++) count += popcount32(words[i]);
+  return count;
+}
+
+function escapeRegExp(text) {
+  return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+// Bracketed text that only qualifies the main name (colours, varieties, origins, "Egg
+// (Chicken)"): it never matches on its own. Shared with build_pairings.py.
+const QUALIFIERS = new Set(require('./ingredient-names.json').qualifiers);
+
+// "Onion (Red)" matches "onion" or "red onion"; "Cumin Seeds (Jeera)" also matches "jeera",
+// but "Egg (Chicken)" doesn't match "chicken". "+" joins parts of a mix, not alternatives.
+function namesFor(selected) {
+  const lower = String(selected).toLowerCase();
+  const main = lower.replace(/\(.*?\)/g, '').trim();
+  const inner = (lower.match(/\((.*?)\)/) || [, ''])[1];
+  const alternatives = inner.split(/[,/]/).map(s => s.trim()).filter(Boolean);
+  const names = [main, ...alternatives.map(alt => `${alt} ${main}`), ...alternatives.filter(alt => !QUALIFIERS.has(alt))];
+  return [...new Set(names.filter(Boolean))];
+}
+
+// Numbers the selection and precompiles a matcher per selected ingredient
+function compileSelection(ingredients) {
+  const matchers = ingredients.map(selected => new RegExp(`\\b(${namesFor(selected).map(escapeRegExp).join('|')})(e?s)?\\b`));
+  const words = Math.max(1, Math.ceil(ingredients.length / 32));
+
+  function bitsetFor(names) {
+    const bits = new Uint32Array(words);
+    names.forEach(name => {
+      const lower = String(name || '').toLowerCase();
+      matchers.forEach((matcher, index) => {
+        if (matcher.test(lower)) bits[index >>> 5] |= 1 << (index & 31);
+      });
+    });
+    return bits;
+  }
+
+  return { size: ingredients.length, bitsetFor };
+}
+
+// Sorts candidates best-first. scoreFor(id) may return a cached transformed recipe
+// (anything with spoonacularScore/healthScore) or undefined.
+function rankCandidates(candidates, ingredients, scoreFor = () => undefined) {
+  if (!candidates.length || !ingredients.length) return candidates.slice();
+
+  const selection = compileSelection(ingredients);
+  const maxLikes = Math.max(1, ...candidates.map(c => c.likes || 0));
+
+  return candidates
+    .map((candidate, upstreamRank) => {
+      const used = selection.bitsetFor((candidate.usedIngredients || []).map(i => i.name || i.original));
+      const coverage = popcount(used) / selection.size;
+      const missed = candidate.missedIngredientCount || 0;
+      const usedCount = candidate.usedIngredientCount || 0;
+      const cached = scoreFor(candidate.id);
+
+      const score =
+        WEIGHTS.coverage * coverage +
+        WEIGHTS.missed * (1 - missed / (missed + usedCount + 1)) +
+        WEIGHTS.quality * ((cached ? cached.spoonacularScore : NEUTRAL_SCORE) / 100) +
+        WEIGHTS.health * ((cached ? cached.healthScore : NEUTRAL_SCORE) / 100) +
+        WEIGHTS.likes * (Math.log1p(candidate.likes || 0) / Math.log1p(maxLikes));
+
+      return { candidate, score, upstreamRank };
+    })
+    .sort((a, b) => b.score - a.score || a.upstreamRank - b.upstreamRank)
+    .map(({ candidate }) => candidate);
+}
+
+module.exports = { rankCandidates, compileSelection, namesFor, popcount };
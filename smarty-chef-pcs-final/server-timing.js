@@ -0,0 +1,97 @@
+// Per-request phase timings, reported in the Server-Timing header and the access log.
+//
+// Each request runs inside an AsyncLocalStorage context, so code deep in the recipe
+// pipeline can record a phase with timed() without a timings object being passed down.
+// Phases recorded without a description are summed (cache lookups, filter checks); those
+// with one are kept as separate entries (one per recipe detail call). Work shared between
+// requests through coalesce() is attributed to the request that started it.
+
+const { AsyncLocalStorage } = require('async_hooks');
+const { performance } = require('perf_hooks');
+
+const storage = new AsyncLocalStorage();
+
+function createTimings() {
+  return { startedAt: performance.now(), phases: new Map(), entries: [] };
+}
+
+function record(name, ms, desc) {
+  const timings = storage.getStore();
+  if (!timings) return;
+  if (desc) {
+    timings.entries.push({ name, dur: ms, desc });
+    return;
+  }
+  const phase = timings.phases.get(name) || { dur: 0, count: 0 };
+  phase.dur += ms;
+  phase.count++;
+  timings.phases.set(name, phase);
+}
+
+async function timed(name, fn, desc) {
+  const start = performance.now();
+  try {
+    return await fn();
+  } finally {
+    record(name, performance.now() - start, desc);
+  }
+}
+
+function timedSync(name, fn) {
+  const start = performance.now();
+  try {
+    return fn();
+  } finally {
+    record(name, performance.now() - start);
+  }
+}
+
+// Header value: summed phases with their call counts, individual entries, then total
+function formatServerTiming(timings) {
+  const metric = (name, dur, desc) => `${name};dur=${dur.toFixed(1)}${desc ? `;desc="${String(desc).replace(/["\\]/g, '')}"` : ''}`;
+  return [
+    ...[...timings.phases].map(([name, { dur, count }]) => metric(name, dur, count > 1 ? `${count} calls` : '')),
+    ...timings.entries.map(({ name, dur, desc }) => metric(name, dur, desc)),
+    metric('total', performance.now() - timings.startedAt)
+  ].join(', ');
+}
+
+// Summary for the access log
+function phaseSummary(timings) {
+  const phases = {};
+  timings.phases.forEach(({ dur, count }, name) => {
+    phases[name] = { ms: Math.round(dur * 10) / 10, count };
+  });
+  timings.entries.forEach(({ name, dur }) => {
+    const phase = phases[name] || (phases[name] = { ms: 0, count: 0, maxMs: 0 });
+    phase.ms = Math.round((phase.ms + dur) * 10) / 10;
+    phase.count++;
+    phase.maxMs = Math.max(phase.maxMs, Math.round(dur * 10) / 10);
+  });
+  return phases;
+}
+
+// Runs the rest of the request inside a timings context and sets Server-Timing when the
+// headers are written. Mount after body parsing: stream 'end' callbacks don't carry the
+// context through. Responses that flush headers early (NDJSON streams) send it as a
+// trailer instead, via serverTimingTrailer().
+function serverTiming() {
+  return (req, res, next) => {
+    const timings = createTimings();
+    res.locals.timings = timings;
+
+    const writeHead = res.writeHead;
+    res.writeHead = function (...args) {
+      if (!res.headersSent && !res.getHeader('Trailer')) res.setHeader('Server-Timing', formatServerTiming(timings));
+      return writeHead.apply(this, args);
+    };
+
+    storage.run(timings, next);
+  };
+}
+
+function serverTimingTrailer(res) {
+  if (res.locals.timings) res.addTrailers({ 'Server-Timing': formatServerTiming(res.locals.timings) });
+}
+
+module.exports = { serverTiming, serverTimingTrailer, timed, timedSync, phaseSummary };
@@ -2,25 +2,214 @@ const express = require('express');
 const cors = require('cors');
 const bodyParser = require('body-parser');
 const path = require('path');
+const os = require('os');
+const cluster = require('cluster');
+const { ALLERGEN_GROUPS, resolveAllergens, compileAllergenMatcher } = require('./allergens');
+const { createSharedCache, pruneCacheDir } = require('./cache');
+const { serveStatic, jsonResponses } = require('./http-cache');
+const { createHttp2Server, earlyHints } = require('./http2-server');
+const { serverTiming, serverTimingTrailer, timed, timedSync, phaseSummary } = require('./server-timing');
+const { createAccessLog } = require('./access-log');
+const { createKeyPool } = require('./key-pool');
+const { createAdmissionController, OverloadedError } = require('./admission');
+const metrics = require('./metrics');
+const { createBackgroundProbe } = require('./api-probe');
+const { createQueryLog, normalizeQuery, queryKey } = require('./query-log');
+const { rankCandidates } = require('./ranking');
+const { createCandidateIndex, rescoreCandidates } = require('./candidate-index');
+const { createLocalCorpus } = require('./local-recipes');
 
 const app = express();
 
-app.use(cors());
-app.use(bodyParser.json());
-app.use(express.static(path.join(__dirname))); // Serve static files from root
+// TRUST_PROXY: set behind a reverse proxy so req.ip (used for fair queuing) is the client's
+// address from X-Forwarded-For. "true", a hop count, or a list of proxy addresses.
+if (process.env.TRUST_PROXY) {
+  const trust = process.env.TRUST_PROXY;
+  app.set('trust proxy', trust === 'true' ? true : /^\d+$/.test(trust) ? Number(trust) : trust);
+}
 
 const PORT = process.env.PORT || 3000;
-const SPOONACULAR_API_KEY = process.env.SPOONACULAR_API_KEY;
 
-if (!SPOONACULAR_API_KEY) {
+// SPOONACULAR_API_KEYS (comma-separated) adds keys to SPOONACULAR_API_KEY. Each request
+// goes to the key with the most quota left; keys answering 402/429 cool down.
+const keyPool = createKeyPool(
+  [process.env.SPOONACULAR_API_KEY, ...String(process.env.SPOONACULAR_API_KEYS || '').split(',')].map(key => key && key.trim()),
+  { rateLimitCooldownMs: parseInt(process.env.KEY_COOLDOWN_MS, 10) || 60 * 1000 }
+);
+
+// Cache-Control max-age (seconds) for static files that aren't fingerprinted
+const STATIC_MAX_AGE = parseInt(process.env.STATIC_MAX_AGE, 10) || 0;
+
+// Optional HTTP/2 listener next to the HTTP/1.1 one: TLS when both files are given,
+// cleartext h2c otherwise
+const HTTP2_PORT = parseInt(process.env.HTTP2_PORT, 10) || 0;
+const TLS_KEY_FILE = process.env.TLS_KEY_FILE;
+const TLS_CERT_FILE = process.env.TLS_CERT_FILE;
+
+// Critical app-shell assets announced with 103 Early Hints before index.html is sent
+const EARLY_HINT_LINKS = [
+  '</style.css>; rel=preload; as=style',
+  '</app.js>; rel=preload; as=script'
+];
+
+// Prometheus metrics, served at GET /metrics
+const API_ROUTES = ['/generate-recipe', '/generate-recipe/stream', '/generate-recipe/more', '/generate-recipe/batch', '/recipes/:id', '/health', '/ready', '/api-status', '/metrics'];
+const requestsInFlight = metrics.gauge('http_requests_in_flight', 'Requests currently being handled, by route');
+const generateDuration = metrics.histogram('generate_recipe_duration_seconds', 'Latency of /generate-recipe requests by route and apiSource');
+const upstreamDuration = metrics.histogram('spoonacular_request_duration_seconds', 'Latency of Spoonacular API calls by endpoint');
+const upstreamRequests = metrics.counter('spoonacular_requests_total', 'Spoonacular API calls by endpoint and HTTP status');
+const recipesFiltered = metrics.counter('recipes_filtered_total', 'Recipes dropped by the dietary and allergy filters');
+const cacheRequests = metrics.counter('cache_requests_total', 'Cache lookups by cache and result');
+const cacheHitRatio = metrics.gauge('cache_hit_ratio', 'Cache hits divided by lookups since start');
+const negativeCacheStores = metrics.counter('negative_cache_stores_total', 'Known-bad upstream results remembered, by kind and reason');
+const negativeCacheSkips = metrics.counter('negative_cache_skips_total', 'Upstream calls skipped because of a negative cache entry, by kind');
+const recipesDeferred = metrics.counter('recipes_deferred_total', 'Detail calls still pending when a response hit its deadline');
+const candidateReuse = metrics.counter('candidate_reuse_total', 'Searches answered fully, partly or not at all from overlapping cached queries');
+const keyRequests = metrics.counter('spoonacular_key_requests_total', 'Spoonacular API calls by pooled key and HTTP status');
+const keyCooldowns = metrics.counter('spoonacular_key_cooldowns_total', 'Pooled keys put on cooldown, by key and reason');
+const keyQuotaLeft = metrics.gauge('spoonacular_key_quota_left', 'Remaining daily quota points last reported for each pooled key');
+const keyAvailable = metrics.gauge('spoonacular_key_available', '1 if the pooled key is usable, 0 while it cools down');
+const admissionLimit = metrics.gauge('admission_concurrency_limit', 'Current limit on concurrent recipe generations');
+const admissionInFlight = metrics.gauge('admission_in_flight', 'Recipe generations currently admitted');
+const admissionQueued = metrics.gauge('admission_queued', 'Requests waiting for a generation slot');
+const admissionWait = metrics.histogram('admission_queue_wait_seconds', 'Time requests spent queued before admission');
+const requestsShed = metrics.counter('requests_shed_total', 'Requests turned away by admission control, by route and reason');
+
+// In cluster mode each scrape reaches one worker, so every series carries its worker id;
+// sum by the other labels across workers (a restarted worker starts a new series)
+if (cluster.isWorker) metrics.setDefaultLabels({ worker: cluster.worker.id });
+
+metrics.onCollect(() => {
+  keyPool.snapshot().forEach(({ name, available, quota }) => {
+    keyAvailable.set({ key: name }, available ? 1 : 0);
+    if (quota) keyQuotaLeft.set({ key: name }, quota.left);
+  });
+});
+
+// Structured access log (JSON lines), off unless ACCESS_LOG_FILE is set. ACCESS_LOG_SAMPLE_RATE
+// (0-1, default 1) samples successful requests; 5xx responses are always logged.
+const accessLog = process.env.ACCESS_LOG_FILE
+  ? createAccessLog({ file: process.env.ACCESS_LOG_FILE, sampleRate: process.env.ACCESS_LOG_SAMPLE_RATE !== undefined ? parseFloat(process.env.ACCESS_LOG_SAMPLE_RATE) || 0 : 1 })
+  : null;
+
+app.use((req, res, next) => {
+  const routePath = req.path.startsWith('/recipes/') ? '/recipes/:id' : req.path;
+  const route = API_ROUTES.includes(routePath) ? routePath : 'static';
+  const stopTimer = route.startsWith('/generate-recipe') ? generateDuration.startTimer({ route }) : null;
+  const startedAt = Date.now();
+
+  requestsInFlight.inc({ route });
+  res.on('close', () => {
+    requestsInFlight.dec({ route });
+    if (stopTimer) stopTimer({ api_source: res.locals.apiSource || 'None' });
+    if (accessLog) {
+      accessLog.log({
+        time: new Date(startedAt).toISOString(),
+        method: req.method,
+        path: req.path,
+        route,
+        status: res.statusCode,
+        durationMs: Date.now() - startedAt,
+        apiSource: res.locals.apiSource,
+        aborted: !res.writableFinished || undefined,
+        phases: res.locals.timings ? phaseSummary(res.locals.timings) : undefined
+      });
+    }
+  });
+  next();
+});
+
+app.use(earlyHints(['/', '/index.html'], EARLY_HINT_LINKS));
+app.use(cors());
+app.use(bodyParser.json());
+app.use(serverTiming());
+app.use(serveStatic(__dirname, { maxAge: STATIC_MAX_AGE })); // Serve static files from root
+app.use(jsonResponses());
+
+if (!keyPool.size) {
   console.warn('⚠️  WARNING: SPOONACULAR_API_KEY is not set in environment variables.');
 }
 
+// CLUSTER_WORKERS: unset or 1 runs a single process, "auto" forks one worker per core
+const CLUSTER_WORKERS = process.env.CLUSTER_WORKERS === 'auto'
+  ? os.cpus().length
+  : Math.max(1, parseInt(process.env.CLUSTER_WORKERS, 10) || 1);
+
+// Shared on-disk cache tier; on by default in cluster mode so workers share one hit ratio
+const CACHE_DIR = process.env.CACHE_DIR || (CLUSTER_WORKERS > 1 ? path.join(os.tmpdir(), 'smarty-chef-cache') : '');
+
+const RECIPES_PER_PAGE = 5;
+const SEARCH_RESULT_COUNT = 40;
+
+// Latency budget for the detail fan-out of one request. Recipes not detailed by then are
+// left to a follow-up cursor instead of holding the response; 0 waits for all of them.
+const RESPONSE_DEADLINE_MS = process.env.RESPONSE_DEADLINE_MS !== undefined ? parseInt(process.env.RESPONSE_DEADLINE_MS, 10) || 0 : 2500;
+
+function responseDeadline() {
+  return RESPONSE_DEADLINE_MS ? Date.now() + RESPONSE_DEADLINE_MS : 0;
+}
+
+// Ranked findByIngredients ID lists, so "more recipes" pages only pay for detail calls
+const searchCache = createSharedCache({ name: 'search', dir: CACHE_DIR, maxEntries: 1000, ttlMs: 30 * 60 * 1000 });
+
+// Raw candidate sets by searched ingredient set, for answering overlapping queries
+const candidateIndex = createCandidateIndex({ maxEntries: 1000, ttlMs: 30 * 60 * 1000 });
+
+// Popular queries, recorded so a restarted server can warm the caches with them
+const queryLog = createQueryLog({ file: process.env.QUERY_LOG_FILE || path.join(__dirname, '.data', 'popular-queries.json') });
+
+// Warm-up: how many of the top logged queries to prefetch at startup, and the pause
+// between them so warming doesn't burst the upstream rate limit
+const WARM_TOP_N = process.env.WARM_TOP_N !== undefined ? parseInt(process.env.WARM_TOP_N, 10) || 0 : 20;
+const WARM_INTERVAL_MS = parseInt(process.env.WARM_INTERVAL_MS, 10) || 1000;
+
+// Transformed recipe details by Spoonacular ID
+const detailCache = createSharedCache({ name: 'detail', dir: CACHE_DIR, maxEntries: 2000, ttlMs: 6 * 60 * 60 * 1000 });
+
+// Known-bad upstream work: searches that found nothing, recipe IDs that returned 4xx, and
+// detail calls that failed. Kept apart from the positive caches with much shorter TTLs so
+// a retry happens soon, but not on every click of "Generate".
+const NEGATIVE_CACHE_TTL_MS = parseInt(process.env.NEGATIVE_CACHE_TTL_MS, 10) || 5 * 60 * 1000;
+const NEGATIVE_FAILURE_TTL_MS = parseInt(process.env.NEGATIVE_FAILURE_TTL_MS, 10) || 30 * 1000;
+const negativeCache = createSharedCache({ name: 'negative', dir: CACHE_DIR, maxEntries: 2000, ttlMs: NEGATIVE_CACHE_TTL_MS });
+
+// 401/402/429 are about the key or quota rather than the recipe, so they aren't pinned
+// to an ID; other 4xx (404 for a removed recipe, 400) won't change on retry
+const NON_RECIPE_STATUSES = [401, 402, 429];
+
+async function rememberFailure(kind, key, reason, status) {
+  negativeCacheStores.inc({ kind, reason });
+  const ttl = reason === 'failure' ? NEGATIVE_FAILURE_TTL_MS : NEGATIVE_CACHE_TTL_MS;
+  await negativeCache.set(`${kind}:${key}`, { reason, status }, ttl);
+}
+
+// Cache reads go through here so they show up as the "cache" phase in Server-Timing
+function cacheGet(cache, key) {
+  return timed('cache', () => cache.get(key));
+}
+
+async function isKnownBad(kind, key) {
+  if (!await cacheGet(negativeCache, `${kind}:${key}`)) return false;
+  negativeCacheSkips.inc({ kind });
+  return true;
+}
+
+metrics.onCollect(() => {
+  Object.entries({ search: searchCache, detail: detailCache, negative: negativeCache }).forEach(([cache, { stats }]) => {
+    cacheRequests.set({ cache, result: 'hit' }, stats.hits - stats.sharedHits);
+    cacheRequests.set({ cache, result: 'shared_hit' }, stats.sharedHits);
+    cacheRequests.set({ cache, result: 'miss' }, stats.misses);
+    const lookups = stats.hits + stats.misses;
+    cacheHitRatio.set({ cache }, lookups ? stats.hits / lookups : 0);
+  });
+});
+
 // Helper function to transform Spoonacular recipe data
 function transformRecipe(recipe) {
-  const ingredients = recipe.extendedIngredients 
+  // complexSearch results carry used/missed ingredient lists instead of extendedIngredients
+  const ingredients = recipe.extendedIngredients
     ? recipe.extendedIngredients.map(i => i.original)
-    : [];
+    : [...(recipe.usedIngredients || []), ...(recipe.missedIngredients || [])].map(i => i.original);
   let instructions = [];
   if (recipe.analyzedInstructions && recipe.analyzedInstructions.length) {
     instructions = recipe.analyzedInstructions[0].steps.map(step => step.step);
@@ -32,6 +221,7 @@ function transformRecipe(recipe) {
     : 'A delicious recipe made with your selected ingredients.';
 
   return {
+    id: recipe.id,
     title: recipe.title || 'Delicious Recipe',
     description,
     ingredients,
@@ -90,101 +280,915 @@ function createFallbackRecipe(ingredients, dietaryPreference) {
   };
 }
 
-app.post('/generate-recipe', async (req, res) => {
-  try {
-    const { ingredients = [], dietaryPreference = '', allergies = '' } = req.body;
+// Spoonacular request helpers shared by the JSON and streaming endpoints
+
+// Quota headers from the most recent upstream response, reported by /api-status
+let lastQuota = null;
+
+function readQuotaHeaders(response) {
+  const left = response.headers && response.headers.get('x-api-quota-left');
+  if (left == null) return null;
+  return {
+    left: Number(left),
+    used: Number(response.headers.get('x-api-quota-used')),
+    request: Number(response.headers.get('x-api-quota-request')),
+    observedAt: new Date().toISOString()
+  };
+}
+
+// Every upstream call goes through here: it adds a key from the pool and records latency,
+// status and quota. A 402/429 puts that key on cooldown and the call is retried with the
+// next available key; the last response is returned once no other key is left.
+async function spoonacularFetch(fetch, endpoint, url) {
+  const tried = [];
 
-    if (!ingredients.length) {
-      return res.status(400).json({ error: 'Please provide at least one ingredient', recipes: [] });
+  for (;;) {
+    const entry = keyPool.acquire(tried);
+    if (!entry) {
+      const err = new Error(keyPool.size ? 'All Spoonacular API keys are rate-limited or out of quota' : 'No Spoonacular API key configured');
+      err.code = keyPool.size ? 'KEYS_EXHAUSTED' : 'NO_API_KEY';
+      throw err;
     }
+    tried.push(entry);
 
-    const fetch = (await import('node-fetch')).default;
-    const ingredientsStr = ingredients.join(',+');
-    const url = `https://api.spoonacular.com/recipes/findByIngredients?ingredients=${encodeURIComponent(ingredientsStr)}&number=8&ranking=2&ignorePantry=true&apiKey=${SPOONACULAR_API_KEY}`;
+    const stopTimer = upstreamDuration.startTimer({ endpoint });
+    let response;
+    try {
+      response = await fetch(`${url}${url.includes('?') ? '&' : '?'}apiKey=${encodeURIComponent(entry.key)}`);
+    } catch (err) {
+      stopTimer();
+      upstreamRequests.inc({ endpoint, status: 'error' });
+      keyRequests.inc({ key: entry.name, status: 'error' });
+      keyPool.release(entry);
+      throw err;
+    }
+
+    stopTimer();
+    const quota = readQuotaHeaders(response);
+    upstreamRequests.inc({ endpoint, status: response.status });
+    keyRequests.inc({ key: entry.name, status: response.status });
+    keyPool.release(entry, { status: response.status, quota });
+    lastQuota = quota || lastQuota;
+
+    if (response.status !== 402 && response.status !== 429) return response;
+    keyCooldowns.inc({ key: entry.name, reason: response.status === 402 ? 'quota' : 'rate_limit' });
+    if (tried.length >= keyPool.size) return response;
+  }
+}
+
+async function searchRecipes(fetch, ingredients) {
+  const ingredientsStr = ingredients.join(',+');
+  const url = `https://api.spoonacular.com/recipes/findByIngredients?ingredients=${encodeURIComponent(ingredientsStr)}&number=${SEARCH_RESULT_COUNT}&ranking=2&ignorePantry=true`;
 
-    const response = await fetch(url);
+  return timed('search', async () => {
+    const response = await spoonacularFetch(fetch, 'findByIngredients', url);
     if (!response.ok) throw new Error(`Spoonacular API search failed: ${response.status}`);
+    return response.json();
+  });
+}
 
-    const foundRecipes = await response.json();
+// Detail and search calls already in flight, so concurrent requests for the same recipe
+// or ingredient set (across a batch, or across users) share one upstream call
+const pendingDetails = new Map();
+const pendingSearches = new Map();
 
-    if (!foundRecipes.length) {
-      return res.json({ recipes: [createFallbackRecipe(ingredients, dietaryPreference)], apiSource: 'Fallback', message: 'No matches found' });
-    }
-
-    const detailedRecipes = await Promise.all(
-      foundRecipes.slice(0,5).map(async (item) => {
-        try {
-          const detailUrl = `https://api.spoonacular.com/recipes/${item.id}/information?includeNutrition=false&apiKey=${SPOONACULAR_API_KEY}`;
-          const dResp = await fetch(detailUrl);
-          if (!dResp.ok) return null;
-          const dData = await dResp.json();
-          return transformRecipe(dData);
-        } catch {
-          return null;
+function coalesce(pending, key, load) {
+  if (pending.has(key)) return pending.get(key);
+  const promise = load().finally(() => pending.delete(key));
+  pending.set(key, promise);
+  return promise;
+}
+
+const partialDetailKey = (id) => `partial:${id}`;
+
+async function fetchRecipeDetail(fetch, id) {
+  const cached = await cacheGet(detailCache, String(id));
+  if (cached) return cached;
+
+  if (await isKnownBad('detail', id)) return null;
+
+  return coalesce(pendingDetails, String(id), () => timed('detail', async () => {
+    try {
+      const detailUrl = `https://api.spoonacular.com/recipes/${id}/information?includeNutrition=false`;
+      const dResp = await spoonacularFetch(fetch, 'information', detailUrl);
+      if (!dResp.ok) {
+        if (dResp.status >= 400 && dResp.status < 500 && !NON_RECIPE_STATUSES.includes(dResp.status)) {
+          await rememberFailure('detail', id, 'client_error', dResp.status);
+        } else if (dResp.status >= 500) {
+          await rememberFailure('detail', id, 'failure', dResp.status);
         }
-      })
+        return null;
+      }
+      const dData = await dResp.json();
+      return detailCache.set(String(id), transformRecipe(dData));
+    } catch (err) {
+      // No usable key says nothing about this recipe, like a 402/429 response
+      if (err.code !== 'KEYS_EXHAUSTED' && err.code !== 'NO_API_KEY') await rememberFailure('detail', id, 'failure');
+      return null;
+    }
+  }, `recipe ${id}`));
+}
+
+// complexSearch parameters for each dietaryPreference option offered in index.html
+const DIET_SEARCH_PARAMS = {
+  vegetarian: { diet: 'vegetarian' },
+  vegan: { diet: 'vegan' },
+  'gluten-free': { diet: 'gluten free', intolerances: ['gluten'] },
+  'dairy-free': { intolerances: ['dairy'] },
+  indian: { cuisine: 'indian' }
+};
+
+function buildComplexSearchUrl(ingredients, dietaryPreference, allergies, offset = 0) {
+  const dietParams = DIET_SEARCH_PARAMS[dietaryPreference.toLowerCase()] || {};
+  const { groups, terms: excluded } = resolveAllergens(allergies);
+  const intolerances = new Set(dietParams.intolerances || []);
+  groups.forEach(group => intolerances.add(ALLERGEN_GROUPS[group].intolerance));
+
+  const params = new URLSearchParams({
+    includeIngredients: ingredients.join(','),
+    sort: 'max-used-ingredients',
+    number: String(RECIPES_PER_PAGE),
+    offset: String(offset),
+    fillIngredients: 'true',
+    addRecipeInformation: 'true',
+    addRecipeInstructions: 'true',
+    ignorePantry: 'true'
+  });
+  if (dietParams.diet) params.set('diet', dietParams.diet);
+  if (dietParams.cuisine) params.set('cuisine', dietParams.cuisine);
+  if (intolerances.size) params.set('intolerances', [...intolerances].join(','));
+  if (excluded.length) params.set('excludeIngredients', excluded.join(','));
+
+  return `https://api.spoonacular.com/recipes/complexSearch?${params}`;
+}
+
+// One call returning only eligible recipes, already detailed. With ignorePantry their
+// ingredient lists are only the used/missed ingredients, so they go into detailCache as
+// partial entries under their own key: ranking may read their scores, but the detail
+// endpoint and the allergen filter only ever see full /information records.
+async function complexSearchRecipes(fetch, ingredients, dietaryPreference, allergies, offset = 0) {
+  const data = await timed('search', async () => {
+    const response = await spoonacularFetch(fetch, 'complexSearch', buildComplexSearchUrl(ingredients, dietaryPreference, allergies, offset));
+    if (!response.ok) throw new Error(`Spoonacular API complex search failed: ${response.status}`);
+    return response.json();
+  });
+  const recipes = (data.results || []).map(transformRecipe);
+  await Promise.all(recipes.filter(recipe => recipe.id).map(recipe =>
+    detailCache.set(partialDetailKey(recipe.id), { ...recipe, partial: true })
+  ));
+  return { recipes, totalResults: data.totalResults || 0 };
+}
+
+// Recipe IDs for an ingredient set, re-ranked locally by ingredient coverage, missed
+// ingredients and (for recipes already detailed) quality, so the detail fetches go to the
+// best candidates first. Searched once and then served from searchCache. On a miss, cached
+// candidates of overlapping queries are re-scored for this selection and only the
+// ingredients none of them covers are searched upstream.
+async function getRankedRecipeIds(fetch, ingredients) {
+  const normalized = normalizeQuery({ ingredients }).ingredients;
+  const key = 'search:' + normalized.join(',');
+  const cached = await cacheGet(searchCache, key);
+  if (cached) return cached;
+  if (await isKnownBad('search', key)) return [];
+
+  return coalesce(pendingSearches, key, async () => {
+    const { candidates: reused, missing } = candidateIndex.plan(normalized);
+    // A superset's candidates may use none of the smaller selection
+    let foundRecipes = rescoreCandidates(reused, ingredients).filter(candidate => candidate.usedIngredientCount > 0);
+
+    if (!foundRecipes.length) {
+      candidateReuse.inc({ result: 'none' });
+      foundRecipes = await searchRecipes(fetch, ingredients);
+      candidateIndex.add(normalized, foundRecipes);
+    } else if (missing.length) {
+      candidateReuse.inc({ result: 'partial' });
+      const searched = ingredients.filter(selected => missing.includes(String(selected).trim().toLowerCase()));
+      candidateIndex.add(missing, await searchRecipes(fetch, searched));
+      const merged = new Map(reused.map(candidate => [candidate.id, candidate]));
+      candidateIndex.plan(missing).candidates.forEach(candidate => merged.set(candidate.id, candidate));
+      foundRecipes = rescoreCandidates([...merged.values()], ingredients);
+    } else {
+      candidateReuse.inc({ result: 'full' });
+    }
+
+    const ranked = rankCandidates(foundRecipes, ingredients, id =>
+      detailCache.peek(String(id)) || detailCache.peek(partialDetailKey(id))
     );
+    const ids = ranked.map(item => item.id);
+    if (ids.length) await searchCache.set(key, ids);
+    else await rememberFailure('search', key, 'empty');
+    return ids;
+  });
+}
 
-    let validRecipes = detailedRecipes.filter(Boolean);
+// Fetches details for ids, passing each recipe to onRecipe as it resolves. With a deadline
+// (a timestamp) it stops waiting once the deadline has passed and at least one recipe has
+// arrived, resolving with the IDs still outstanding. Those calls keep running and land in
+// the detail cache, so the follow-up request for them is served locally.
+async function detailRecipes(fetch, ids, onRecipe, deadline = 0) {
+  const outstanding = new Set(ids);
+  let delivered = 0;
+  let closed = false;
+  let firstRecipe;
+  const gotFirst = new Promise(resolve => { firstRecipe = resolve; });
 
-    if (dietaryPreference) {
-      const pref = dietaryPreference.toLowerCase().replace('-', ' ');
-      validRecipes = validRecipes.filter(recipe => 
-        recipe.dietary_labels.some(label => label.toLowerCase().includes(pref))
-      );
+  const all = Promise.all(ids.map(async (id) => {
+    const recipe = await fetchRecipeDetail(fetch, id);
+    if (closed) return;
+    outstanding.delete(id);
+    if (recipe) {
+      delivered++;
+      onRecipe(recipe);
+      firstRecipe();
     }
+  }));
 
-    if (allergies) {
-      const allergs = allergies.split(',').map(a => a.trim().toLowerCase());
-      validRecipes = validRecipes.filter(recipe => {
-        const hText = (recipe.title + ' ' + recipe.ingredients.join(' ')).toLowerCase();
-        return !allergs.some(all => hText.includes(all));
-      });
+  if (!deadline) {
+    await all;
+    return [];
+  }
+
+  let timer;
+  const expired = new Promise(resolve => { timer = setTimeout(resolve, Math.max(0, deadline - Date.now())); });
+  await Promise.race([all, expired]);
+  clearTimeout(timer);
+  if (outstanding.size && !delivered) await Promise.race([all, gotFirst]);
+
+  closed = true;
+  if (outstanding.size) recipesDeferred.inc({}, outstanding.size);
+  return [...outstanding];
+}
+
+// Finds one page of recipes for a query, passing each detailed recipe to onRecipe as soon
+// as it is available. Queries with a diet or allergies go through complexSearch so the
+// filtering happens upstream; plain ingredient queries use findByIngredients plus detail
+// calls. Resolves with the number of candidates found, the offset of the next page (null
+// when there is none) and the IDs whose details missed the deadline. pendingIds, from a
+// cursor, fetches those stragglers instead of the page at offset.
+async function collectRecipes(fetch, { ingredients, dietaryPreference, allergies }, onRecipe, offset = 0, { deadline = 0, pendingIds = null } = {}) {
+  const pageEnd = offset + RECIPES_PER_PAGE;
+
+  if (dietaryPreference || allergies) {
+    const key = `complex:${queryKey({ ingredients, dietaryPreference, allergies })}:${offset}`;
+    const cached = await cacheGet(searchCache, key) || (await isKnownBad('search', key) ? { recipes: [], totalResults: 0 } : null);
+    const { recipes, totalResults } = cached || await coalesce(pendingSearches, key, async () => {
+      const page = await complexSearchRecipes(fetch, ingredients, dietaryPreference, allergies, offset);
+      if (page.recipes.length) await searchCache.set(key, page);
+      else await rememberFailure('search', key, 'empty');
+      return page;
+    });
+    recipes.forEach(onRecipe);
+    return { totalFound: totalResults, nextOffset: recipes.length && pageEnd < totalResults ? pageEnd : null, pendingIds: [] };
+  }
+
+  const ids = await getRankedRecipeIds(fetch, ingredients);
+  const resumeAt = pendingIds ? offset : pageEnd;
+  const late = await detailRecipes(fetch, pendingIds || ids.slice(offset, pageEnd), onRecipe, deadline);
+  return {
+    totalFound: ids.length,
+    nextOffset: late.length || resumeAt < ids.length ? resumeAt : null,
+    pendingIds: late
+  };
+}
+
+// Cursors carry the query and the next offset, so any worker can serve the next page.
+// A cursor with pending IDs first returns the recipes that missed the previous deadline.
+function encodeCursor({ ingredients, dietaryPreference, allergies }, offset, pendingIds = []) {
+  const cursor = { i: ingredients, d: dietaryPreference, a: allergies, o: offset };
+  if (pendingIds.length) cursor.p = pendingIds;
+  return Buffer.from(JSON.stringify(cursor)).toString('base64url');
+}
+
+function decodeCursor(cursor) {
+  try {
+    const { i, d, a, o, p } = JSON.parse(Buffer.from(String(cursor), 'base64url').toString('utf8'));
+    if (!Array.isArray(i) || !i.length || !Number.isInteger(o) || o < 0) return null;
+    if (p !== undefined && (!Array.isArray(p) || !p.length || p.length > RECIPES_PER_PAGE || !p.every(Number.isInteger))) return null;
+    return {
+      query: { ingredients: i.map(String), dietaryPreference: String(d || ''), allergies: String(a || '') },
+      offset: o,
+      pendingIds: p || null
+    };
+  } catch {
+    return null;
+  }
+}
+
+// Returns a predicate applying the dietary preference and allergy filters to one recipe
+function createRecipeFilter(dietaryPreference, allergies) {
+  const pref = dietaryPreference ? dietaryPreference.toLowerCase().replace('-', ' ') : '';
+  const allergenMatcher = compileAllergenMatcher(allergies);
+
+  return (recipe) => timedSync('filter', () => {
+    if (pref && !recipe.dietary_labels.some(label => label.toLowerCase().replace('-', ' ').includes(pref))) {
+      recipesFiltered.inc({ filter: 'diet' });
+      return false;
+    }
+    if (!allergenMatcher.isEmpty && allergenMatcher.matches(recipe.title + ' ' + recipe.ingredients.join('\n'))) {
+      recipesFiltered.inc({ filter: 'allergy' });
+      return false;
+    }
+    return true;
+  });
+}
+
+// RECIPE_SOURCE picks where recipes come from: "upstream" (Spoonacular), "local" (the
+// bundled corpus), "hybrid" (local results first, upstream ones merged in) or "auto"
+// (default). Local matches also replace the synthetic fallback recipe whenever upstream
+// has nothing. "auto" decides from the background probe's recent results:
+//   local    - no API key, or the last 2+ probes failed
+//   hybrid   - upstream reachable but degraded: a failure among the last
+//              HYBRID_PROBE_WINDOW probes, or their median latency over HYBRID_LATENCY_MS
+//   upstream - otherwise, including before the first probe
+const RECIPE_SOURCE = (process.env.RECIPE_SOURCE || 'auto').toLowerCase();
+const HYBRID_LATENCY_MS = parseInt(process.env.HYBRID_LATENCY_MS, 10) || 1500;
+const HYBRID_PROBE_WINDOW = 5;
+const localCorpus = createLocalCorpus(require('./local-recipes.json'));
+
+function chooseRecipeSource() {
+  if (RECIPE_SOURCE !== 'auto') return RECIPE_SOURCE;
+  if (!keyPool.size) return 'local';
+  const { last, consecutiveFailures, history } = apiProbe.snapshot();
+  if (!last) return 'upstream';
+  if (!last.ok && consecutiveFailures >= 2) return 'local';
+
+  const recent = history.slice(-HYBRID_PROBE_WINDOW);
+  const latencies = recent.filter(probe => probe.ok).map(probe => probe.latencyMs).sort((a, b) => a - b);
+  const medianLatency = latencies.length ? latencies[Math.floor(latencies.length / 2)] : 0;
+  return recent.some(probe => !probe.ok) || medianLatency > HYBRID_LATENCY_MS ? 'hybrid' : 'upstream';
+}
+
+function localRecipes({ ingredients }, passesFilters) {
+  return localCorpus.search(ingredients).filter(passesFilters).slice(0, RECIPES_PER_PAGE);
+}
+
+// Local matches when there are any, otherwise the synthetic recipe. Without a filter (the
+// request failed before one was built) only the synthetic recipe is served.
+function fallbackRecipes(query, passesFilters) {
+  const recipes = passesFilters ? localRecipes(query, passesFilters) : [];
+  return recipes.length
+    ? { recipes, apiSource: 'Local' }
+    : { recipes: [createFallbackRecipe(query.ingredients, query.dietaryPreference)], apiSource: 'Fallback' };
+}
+
+// Appends recipes whose titles aren't already present
+function mergeRecipes(recipes, extra) {
+  const titles = new Set(recipes.map(recipe => recipe.title.toLowerCase()));
+  return recipes.concat(extra.filter(recipe => !titles.has(recipe.title.toLowerCase())));
+}
+
+// Runs one query and builds the /generate-recipe response body, falling back to local
+// or synthetic recipes when nothing matches or the API is unavailable
+async function buildRecipeResponse({ ingredients, dietaryPreference = '', allergies = '' }) {
+  const deadline = responseDeadline();
+  const query = { ingredients, dietaryPreference, allergies };
+  let passesFilters = null;
+
+  try {
+    passesFilters = createRecipeFilter(dietaryPreference, allergies);
+    const source = chooseRecipeSource();
+    queryLog.record(query);
+
+    if (source === 'local') {
+      const { recipes, apiSource } = fallbackRecipes(query, passesFilters);
+      return { recipes, apiSource, afterFiltering: recipes.length, message: apiSource === 'Local' ? 'Served from the local recipe corpus' : 'No local matches found' };
+    }
+
+    const fetch = (await import('node-fetch')).default;
+    let validRecipes = [];
+
+    const { totalFound, nextOffset, pendingIds } = await collectRecipes(fetch, query, (recipe) => {
+      if (passesFilters(recipe)) validRecipes.push(recipe);
+    }, 0, { deadline });
+
+    if (!totalFound) {
+      return { ...fallbackRecipes(query, passesFilters), message: 'No matches found' };
+    }
+
+    let apiSource = 'Spoonacular';
+    if (source === 'hybrid') {
+      validRecipes = mergeRecipes(localRecipes(query, passesFilters), validRecipes);
+      apiSource = 'Hybrid';
     }
 
     if (validRecipes.length === 0) {
-      validRecipes = [createFallbackRecipe(ingredients, dietaryPreference)];
+      ({ recipes: validRecipes, apiSource } = fallbackRecipes(query, passesFilters));
     }
 
-    res.json({ recipes: validRecipes, apiSource: 'Spoonacular', totalFound: foundRecipes.length, afterFiltering: validRecipes.length });
+    return {
+      recipes: validRecipes,
+      apiSource,
+      totalFound,
+      afterFiltering: validRecipes.length,
+      pending: pendingIds.length,
+      nextCursor: nextOffset !== null ? encodeCursor(query, nextOffset, pendingIds) : null
+    };
 
   } catch (err) {
-    const { ingredients = [], dietaryPreference = '' } = req.body;
-    res.json({
-      recipes: [createFallbackRecipe(ingredients, dietaryPreference)],
-      apiSource: 'Fallback',
+    const fallback = fallbackRecipes(query, passesFilters);
+    return {
+      ...fallback,
       error: err.message,
-      message: 'API unavailable, showing fallback recipe'
-    });
+      message: fallback.apiSource === 'Local' ? 'API unavailable, showing local recipes' : 'API unavailable, showing fallback recipe'
+    };
   }
+}
+
+// Fields a client can ask for with "fields" (body array, or comma-separated in the body or
+// query string). id is always included so the rest can be fetched from /recipes/:id.
+const RECIPE_FIELDS = ['id', 'title', 'description', 'ingredients', 'instructions', 'time', 'dietary_labels', 'category', 'servings', 'image', 'sourceUrl', 'spoonacularScore', 'healthScore'];
+
+// Returns null for "all fields", a field list, or { error } for unknown names
+function parseFields(raw) {
+  if (raw === undefined || raw === null || raw === '') return null;
+  const names = (Array.isArray(raw) ? raw : String(raw).split(',')).map(name => String(name).trim()).filter(Boolean);
+  const unknown = names.filter(name => !RECIPE_FIELDS.includes(name));
+  if (unknown.length) return { error: `Unknown fields: ${unknown.join(', ')}. Available: ${RECIPE_FIELDS.join(', ')}` };
+  return ['id', ...names.filter(name => name !== 'id')];
+}
+
+// Recipes without an id (the synthetic fallback) have no detail endpoint, so they're
+// always sent whole
+function projectRecipe(recipe, fields) {
+  if (!fields || recipe.id === undefined) return recipe;
+  const projected = {};
+  fields.forEach(name => {
+    if (recipe[name] !== undefined) projected[name] = recipe[name];
+  });
+  return projected;
+}
+
+function projectResult(result, fields) {
+  return fields && result.recipes ? { ...result, recipes: result.recipes.map(recipe => projectRecipe(recipe, fields)) } : result;
+}
+
+const isStringArray = (value) => Array.isArray(value) && value.every(item => typeof item === 'string');
+
+// Checks the query fields of a recipe request. Returns { query } with allergies joined to
+// one comma-separated string, or { error } for a 400; missing or null fields are empty.
+function parseRecipeQuery(body) {
+  if (!body || typeof body !== 'object' || Array.isArray(body)) {
+    return { error: 'A query must be a JSON object' };
+  }
+  const ingredients = body.ingredients ?? [];
+  const dietaryPreference = body.dietaryPreference ?? '';
+  const allergies = body.allergies ?? '';
+
+  if (!isStringArray(ingredients)) return { error: 'ingredients must be an array of strings' };
+  if (typeof dietaryPreference !== 'string') return { error: 'dietaryPreference must be a string' };
+  if (typeof allergies !== 'string' && !isStringArray(allergies)) {
+    return { error: 'allergies must be a string or an array of strings' };
+  }
+  if (!ingredients.length) return { error: 'Please provide at least one ingredient' };
+
+  return { query: { ingredients, dietaryPreference, allergies: Array.isArray(allergies) ? allergies.join(',') : allergies } };
+}
+
+// Admission control for routes that call upstream. Limits are per process.
+const admission = createAdmissionController({
+  maxConcurrent: parseInt(process.env.MAX_CONCURRENT_GENERATIONS, 10) || 32,
+  minConcurrent: parseInt(process.env.MIN_CONCURRENT_GENERATIONS, 10) || 4,
+  maxQueue: process.env.MAX_QUEUE !== undefined ? parseInt(process.env.MAX_QUEUE, 10) || 0 : 100,
+  maxQueuePerClient: parseInt(process.env.MAX_QUEUE_PER_CLIENT, 10) || 10,
+  maxWaitMs: parseInt(process.env.MAX_QUEUE_WAIT_MS, 10) || 5000,
+  targetLatencyMs: process.env.TARGET_LATENCY_MS !== undefined ? parseInt(process.env.TARGET_LATENCY_MS, 10) || 0 : 4000
 });
 
-app.get('/health', (req, res) => {
-  res.json({
-    status: "✅ Smarty-Chef.PCS Server Running!",
-    timestamp: new Date().toISOString(),
-    apiKeyStatus: SPOONACULAR_API_KEY ? "✅ Configured" : "❌ Missing",
-    version: "2.0.0"
+metrics.onCollect(() => {
+  admissionLimit.set({}, admission.limit);
+  admissionInFlight.set({}, admission.inFlight);
+  admissionQueued.set({}, admission.queued);
+});
+
+// Waits for a generation slot, fairly per client IP; resolves with its release function
+async function acquireSlot(req) {
+  const stopTimer = admissionWait.startTimer();
+  try {
+    return await admission.acquire(req.ip);
+  } catch (err) {
+    if (err instanceof OverloadedError) requestsShed.inc({ route: req.route ? req.route.path : req.path, reason: err.reason });
+    throw err;
+  } finally {
+    stopTimer();
+  }
+}
+
+// Holds a generation slot until the response closes. Shed requests get 503 + Retry-After,
+// or whatever onShed answers instead.
+function admit(onShed) {
+  return async (req, res, next) => {
+    let closed = false;
+    res.on('close', () => { closed = true; });
+
+    let release;
+    try {
+      release = await acquireSlot(req);
+    } catch (err) {
+      if (!(err instanceof OverloadedError)) return next(err);
+      res.set('Retry-After', String(err.retryAfterSeconds));
+      if (onShed) return onShed(req, res, err);
+      return res.status(503).json({ error: err.message, retryAfter: err.retryAfterSeconds, recipes: [] });
+    }
+
+    if (closed) return release();
+    res.on('close', release);
+    next();
+  };
+}
+
+// Overloaded /generate-recipe requests are answered from the local corpus when it has
+// matches, since that costs no upstream calls
+function shedToLocal(req, res, err) {
+  const { query } = parseRecipeQuery(req.body);
+  const recipes = query
+    ? localRecipes(query, createRecipeFilter(query.dietaryPreference, query.allergies))
+    : [];
+
+  if (!recipes.length) {
+    return res.status(503).json({ error: err.message, retryAfter: err.retryAfterSeconds, recipes: [] });
+  }
+
+  const fields = parseFields(req.body.fields);
+  res.locals.apiSource = 'Local';
+  res.json(projectResult({
+    recipes,
+    apiSource: 'Local',
+    afterFiltering: recipes.length,
+    degraded: 'overloaded',
+    message: 'Server busy, showing local recipes',
+    retryAfter: err.retryAfterSeconds
+  }, fields && fields.error ? null : fields));
+}
+
+app.post('/generate-recipe', admit(shedToLocal), async (req, res) => {
+  const { query, error } = parseRecipeQuery(req.body);
+  const fields = parseFields(req.body.fields !== undefined ? req.body.fields : req.query.fields);
+
+  if (error) {
+    return res.status(400).json({ error, recipes: [] });
+  }
+  if (fields && fields.error) {
+    return res.status(400).json({ error: fields.error, recipes: [] });
+  }
+
+  const result = await buildRecipeResponse(query);
+  res.locals.apiSource = result.apiSource;
+  res.json(projectResult(result, fields));
+});
+
+// Runs fn over items with at most limit calls in flight, preserving result order
+async function mapWithConcurrency(items, limit, fn) {
+  const results = new Array(items.length);
+  let next = 0;
+
+  async function worker() {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index], index);
+    }
+  }
+
+  await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
+  return results;
+}
+
+// The batch's overall source for the request metrics: the upstream-backed sources win
+// over the local ones, in this order
+const BATCH_SOURCE_ORDER = ['Spoonacular', 'Hybrid', 'Local', 'Fallback'];
+function batchApiSource(results) {
+  return BATCH_SOURCE_ORDER.find(source => results.some(result => result.apiSource === source)) || 'Fallback';
+}
+
+const BATCH_MAX_QUERIES = 20;
+const BATCH_CONCURRENCY = parseInt(process.env.BATCH_CONCURRENCY, 10) || 4;
+
+// Batch variant for meal planning: many ingredient sets in one request. Searches run with
+// bounded parallelism, and each unique recipe ID is detailed once for the whole batch
+// (identical ingredient sets also share one search), then results are returned per query.
+// Each query takes its own generation slot, so a batch counts against the concurrency
+// limit like the separate requests it replaces
+app.post('/generate-recipe/batch', async (req, res) => {
+  const { queries } = req.body;
+  const fields = parseFields(req.body.fields !== undefined ? req.body.fields : req.query.fields);
+
+  if (!Array.isArray(queries) || !queries.length) {
+    return res.status(400).json({ error: 'Please provide a non-empty queries array', results: [] });
+  }
+  if (fields && fields.error) {
+    return res.status(400).json({ error: fields.error, results: [] });
+  }
+  if (queries.length > BATCH_MAX_QUERIES) {
+    return res.status(400).json({ error: `A batch can contain at most ${BATCH_MAX_QUERIES} queries`, results: [] });
+  }
+
+  let closed = false;
+  res.on('close', () => { closed = true; });
+
+  // A bad or failing query becomes an error entry of its own, never a rejection that
+  // would take the rest of the batch with it
+  const results = await mapWithConcurrency(queries, BATCH_CONCURRENCY, async (item) => {
+    const { query, error } = parseRecipeQuery(item);
+    if (error) return { error, recipes: [] };
+    if (closed) return { error: 'Request closed', recipes: [] };
+
+    let release;
+    try {
+      release = await acquireSlot(req);
+    } catch (err) {
+      if (!(err instanceof OverloadedError)) return { error: err.message, recipes: [] };
+      return { error: err.message, retryAfter: err.retryAfterSeconds, recipes: [] };
+    }
+    try {
+      return projectResult(await buildRecipeResponse(query), fields);
+    } catch (err) {
+      return { error: err.message, recipes: [] };
+    } finally {
+      release();
+    }
   });
+
+  res.locals.apiSource = batchApiSource(results);
+  res.json({ results, totalQueries: queries.length });
 });
 
-app.get('/api-status', async (req, res) => {
+// Streaming variant: writes one NDJSON frame per recipe as soon as its detail call
+// resolves and passes the filters, then a closing summary frame. In hybrid mode the local
+// matches go out first, before any upstream call has returned.
+app.post('/generate-recipe/stream', admit(), async (req, res) => {
+  const { query, error } = parseRecipeQuery(req.body);
+  const fields = parseFields(req.body.fields !== undefined ? req.body.fields : req.query.fields);
+
+  if (error) {
+    return res.status(400).json({ error, recipes: [] });
+  }
+  if (fields && fields.error) {
+    return res.status(400).json({ error: fields.error, recipes: [] });
+  }
+
+  res.status(200);
+  res.set({
+    'Content-Type': 'application/x-ndjson; charset=utf-8',
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'
+  });
+  // Headers go out before any work is done, so Server-Timing follows as a trailer
+  // (HTTP/1.0 has no chunked encoding to carry one)
+  const trailers = req.httpVersionMajor > 1 || req.httpVersionMinor >= 1;
+  if (trailers) res.set('Trailer', 'Server-Timing');
+  res.flushHeaders();
+
+  const deadline = responseDeadline();
+  let passesFilters = null;
+
+  const writeFrame = (frame) => res.write(JSON.stringify(frame) + '\n');
+  const endStream = () => {
+    if (trailers) serverTimingTrailer(res);
+    res.end();
+  };
+  const sentTitles = new Set();
+  const sendRecipe = (recipe) => {
+    const title = recipe.title.toLowerCase();
+    if (sentTitles.has(title) || res.writableEnded) return;
+    sentTitles.add(title);
+    writeFrame({ type: 'recipe', recipe: projectRecipe(recipe, fields) });
+  };
+  const sendFallback = () => {
+    const fallback = fallbackRecipes(query, passesFilters);
+    fallback.recipes.forEach(sendRecipe);
+    return fallback.apiSource;
+  };
+
   try {
+    passesFilters = createRecipeFilter(query.dietaryPreference, query.allergies);
+    const source = chooseRecipeSource();
+    queryLog.record(query);
+
+    if (source === 'local') {
+      const apiSource = sendFallback();
+      res.locals.apiSource = apiSource;
+      writeFrame({ type: 'summary', apiSource, afterFiltering: sentTitles.size });
+      return endStream();
+    }
+
+    if (source === 'hybrid') {
+      localRecipes(query, passesFilters).forEach(sendRecipe);
+    }
+
     const fetch = (await import('node-fetch')).default;
-    const testUrl = `https://api.spoonacular.com/recipes/random?number=1&apiKey=${SPOONACULAR_API_KEY}`;
-    const resp = await fetch(testUrl);
-    res.json({
-      spoonacularAPI: resp.ok ? "✅ Connected" : "❌ Failed",
-      statusCode: resp.status,
-      timestamp: new Date().toISOString()
+
+    const { totalFound, nextOffset, pendingIds } = await collectRecipes(fetch, query, (recipe) => {
+      if (passesFilters(recipe)) sendRecipe(recipe);
+    }, 0, { deadline });
+
+    if (!totalFound) {
+      const apiSource = sentTitles.size ? 'Local' : sendFallback();
+      writeFrame({ type: 'summary', apiSource, message: 'No matches found' });
+      res.locals.apiSource = apiSource;
+      return endStream();
+    }
+
+    let apiSource = source === 'hybrid' ? 'Hybrid' : 'Spoonacular';
+    if (sentTitles.size === 0) {
+      apiSource = sendFallback();
+    }
+
+    res.locals.apiSource = apiSource;
+    writeFrame({
+      type: 'summary',
+      apiSource,
+      totalFound,
+      afterFiltering: sentTitles.size,
+      pending: pendingIds.length,
+      nextCursor: nextOffset !== null ? encodeCursor(query, nextOffset, pendingIds) : null
     });
-  } catch (error) {
+    endStream();
+
+  } catch (err) {
+    const apiSource = sentTitles.size ? 'Local' : sendFallback();
+    res.locals.apiSource = apiSource;
+    writeFrame({
+      type: 'summary',
+      apiSource,
+      error: err.message,
+      message: apiSource === 'Local' ? 'API unavailable, showing local recipes' : 'API unavailable, showing fallback recipe'
+    });
+    endStream();
+  }
+});
+
+// Next page for a cursor returned by /generate-recipe. The ranked ID list is cached, so
+// only the new detail calls go upstream; cursors with pending IDs return the previous
+// page's stragglers, usually from the detail cache by now. No fallback recipe here: an
+// empty page with a nextCursor just means every recipe on it was filtered out.
+async function handleMoreRecipes(req, res) {
+  const params = req.method === 'GET' ? req.query : (req.body || {});
+  const cursor = params.cursor;
+  const decoded = decodeCursor(cursor);
+  const fields = parseFields(params.fields);
+
+  if (!decoded) {
+    return res.status(400).json({ error: 'Invalid or missing cursor', recipes: [] });
+  }
+  if (fields && fields.error) {
+    return res.status(400).json({ error: fields.error, recipes: [] });
+  }
+
+  try {
+    const { query, offset } = decoded;
+    const deadline = responseDeadline();
+    const fetch = (await import('node-fetch')).default;
+    const passesFilters = createRecipeFilter(query.dietaryPreference, query.allergies);
+    const recipes = [];
+
+    const { totalFound, nextOffset, pendingIds } = await collectRecipes(fetch, query, (recipe) => {
+      if (passesFilters(recipe)) recipes.push(recipe);
+    }, offset, { deadline, pendingIds: decoded.pendingIds });
+
+    res.locals.apiSource = 'Spoonacular';
     res.json({
-      spoonacularAPI: "❌ Connection Failed",
-      error: error.message,
-      timestamp: new Date().toISOString()
+      recipes: recipes.map(recipe => projectRecipe(recipe, fields)),
+      apiSource: 'Spoonacular',
+      totalFound,
+      afterFiltering: recipes.length,
+      pending: pendingIds.length,
+      nextCursor: nextOffset !== null ? encodeCursor(query, nextOffset, pendingIds) : null
     });
+
+  } catch (err) {
+    res.status(502).json({ error: err.message, recipes: [], nextCursor: cursor });
+  }
+}
+
+app.get('/generate-recipe/more', admit(), handleMoreRecipes);
+app.post('/generate-recipe/more', admit(), handleMoreRecipes);
+
+// One full recipe, for clients that listed recipes with a reduced "fields" set. Spoonacular
+// IDs come from the detail cache when possible; "local-N" IDs from the bundled corpus.
+app.get('/recipes/:id', admit(), async (req, res) => {
+  const { id } = req.params;
+  const fields = parseFields(req.query.fields);
+
+  if (fields && fields.error) {
+    return res.status(400).json({ error: fields.error });
+  }
+
+  if (id.startsWith('local-')) {
+    const recipe = localCorpus.get(id);
+    if (!recipe) return res.status(404).json({ error: 'Recipe not found' });
+    res.locals.apiSource = 'Local';
+    return res.json({ recipe: projectRecipe(recipe, fields), apiSource: 'Local' });
+  }
+
+  if (!/^\d+$/.test(id)) {
+    return res.status(400).json({ error: 'Invalid recipe id' });
+  }
+
+  try {
+    const fetch = (await import('node-fetch')).default;
+    const recipe = await fetchRecipeDetail(fetch, Number(id));
+    if (!recipe) return res.status(404).json({ error: 'Recipe not found' });
+    res.locals.apiSource = 'Spoonacular';
+    res.json({ recipe: projectRecipe({ ...recipe, id: Number(id) }, fields), apiSource: 'Spoonacular' });
+  } catch (err) {
+    res.status(502).json({ error: err.message });
+  }
+});
+
+// Startup cache warming from the popular-query log. Runs in the background while the
+// server takes traffic; /ready reports 503 until it finishes, for load balancers that
+// should hold traffic until the caches are warm.
+const warmup = { state: 'pending', total: 0, completed: 0, failed: 0, startedAt: null, finishedAt: null };
+
+async function warmCaches(onProgress = () => {}) {
+  if (!WARM_TOP_N || !keyPool.size) {
+    warmup.state = 'skipped';
+    return onProgress(warmup);
+  }
+
+  warmup.state = 'warming';
+  warmup.startedAt = new Date().toISOString();
+
+  try {
+    const queries = await queryLog.top(WARM_TOP_N);
+    warmup.total = queries.length;
+    onProgress(warmup);
+
+    const fetch = (await import('node-fetch')).default;
+    for (const query of queries) {
+      try {
+        await collectRecipes(fetch, query, () => {});
+      } catch {
+        warmup.failed++;
+      }
+      warmup.completed++;
+      onProgress(warmup);
+      await new Promise(resolve => setTimeout(resolve, WARM_INTERVAL_MS));
+    }
+
+    warmup.state = 'done';
+    console.log(`🔥 Cache warm-up finished: ${warmup.completed - warmup.failed}/${warmup.total} popular queries prefetched`);
+  } catch (err) {
+    // A failed warm-up must not keep /ready at 503; the server works cold
+    warmup.state = 'failed';
+    console.warn(`⚠️  Cache warm-up failed: ${err.message}`);
+  }
+
+  warmup.finishedAt = new Date().toISOString();
+  onProgress(warmup);
+}
+
+app.get('/health', (req, res) => {
+  res.json({
+    status: "✅ Smarty-Chef.PCS Server Running!",
+    timestamp: new Date().toISOString(),
+    apiKeyStatus: keyPool.size > 1 ? `✅ Configured (${keyPool.size} keys)` : keyPool.size ? "✅ Configured" : "❌ Missing",
+    version: "2.0.0",
+    warmup
+  });
+});
+
+app.get('/ready', (req, res) => {
+  const ready = !['pending', 'warming'].includes(warmup.state);
+  res.status(ready ? 200 : 503).json({ ready, warmup });
+});
+
+// Connectivity probe behind /api-status, run on a schedule rather than per request.
+// API_STATUS_INTERVAL_MS sets the base interval; failures back off from there.
+const apiProbe = createBackgroundProbe(async () => {
+  const fetch = (await import('node-fetch')).default;
+  const testUrl = 'https://api.spoonacular.com/recipes/random?number=1';
+  const resp = await spoonacularFetch(fetch, 'random', testUrl);
+  return { ok: resp.ok, statusCode: resp.status, quota: readQuotaHeaders(resp) };
+}, { intervalMs: parseInt(process.env.API_STATUS_INTERVAL_MS, 10) || 5 * 60 * 1000 });
+
+app.get('/api-status', (req, res) => {
+  const { last, ageMs, consecutiveFailures, nextProbeInMs, history } = apiProbe.snapshot();
+  const quota = [last && last.quota, lastQuota]
+    .filter(Boolean)
+    .sort((a, b) => Date.parse(b.observedAt) - Date.parse(a.observedAt))[0] || null;
+
+  let spoonacularAPI = '⏳ Probe pending';
+  if (last) {
+    spoonacularAPI = last.ok ? '✅ Connected' : last.statusCode ? '❌ Failed' : '❌ Connection Failed';
   }
+
+  res.json({
+    spoonacularAPI,
+    statusCode: last ? last.statusCode : undefined,
+    error: last ? last.error : undefined,
+    timestamp: last ? last.timestamp : new Date().toISOString(),
+    probeAgeMs: ageMs,
+    nextProbeInMs,
+    consecutiveFailures,
+    latencyMs: last ? last.latencyMs : undefined,
+    latencyHistory: history,
+    quota,
+    keys: keyPool.snapshot()
+  });
+});
+
+app.get('/metrics', (req, res) => {
+  res.type('text/plain; version=0.0.4; charset=utf-8').send(metrics.render());
 });
 
 app.get('/', (req, res) => {
@@ -195,22 +1199,92 @@ app.get('/', (req, res) => {
 app.use((req, res) => {
   res.status(404).json({
     error: 'Not found',
-    availableEndpoints: ['GET /', 'POST /generate-recipe', 'GET /health', 'GET /api-status']
+    availableEndpoints: ['GET /', 'POST /generate-recipe', 'POST /generate-recipe/stream', 'GET|POST /generate-recipe/more', 'POST /generate-recipe/batch', 'GET /recipes/:id', 'GET /health', 'GET /ready', 'GET /api-status', 'GET /metrics']
   });
 });
 
-app.listen(PORT, () => {
-  console.log(`🚀 Smarty-Chef.PCS Server started on port ${PORT}`);
-  console.log(`💻 Open http://localhost:${PORT}`);
-  console.log(`🔑 API key status: ${SPOONACULAR_API_KEY ? 'Configured' : 'Missing'}`);
-});
+function startServer() {
+  app.listen(PORT, () => {
+    const worker = cluster.isWorker ? ` (worker ${cluster.worker.id}, pid ${process.pid})` : '';
+    console.log(`🚀 Smarty-Chef.PCS Server started on port ${PORT}${worker}`);
+    if (cluster.isWorker && cluster.worker.id > 1) return;
+    console.log(`💻 Open http://localhost:${PORT}`);
+    console.log(`🔑 API key status: ${keyPool.size ? `Configured (${keyPool.size} key${keyPool.size > 1 ? 's' : ''})` : 'Missing'}`);
+    console.log(`🗄️  Cache: ${CACHE_DIR ? `shared (${CACHE_DIR})` : 'in-memory'}`);
+  });
 
-process.on('SIGTERM', () => {
-  console.log('🔄 Server shutting down...');
-  process.exit(0);
-});
+  if (HTTP2_PORT) {
+    const secure = Boolean(TLS_KEY_FILE && TLS_CERT_FILE);
+    createHttp2Server(app, { keyFile: TLS_KEY_FILE, certFile: TLS_CERT_FILE }).listen(HTTP2_PORT, () => {
+      if (cluster.isWorker && cluster.worker.id > 1) return;
+      console.log(`⚡ HTTP/2 (${secure ? 'TLS' : 'h2c'}) listening on port ${HTTP2_PORT}`);
+    });
+  }
+}
+
+// Cluster mode: the primary only forks and supervises workers, which share the listening
+// socket; the on-disk cache tier is pruned from the primary so workers don't race on it.
+if (CLUSTER_WORKERS > 1 && cluster.isPrimary) {
+  console.log(`🧩 Cluster mode: starting ${CLUSTER_WORKERS} workers`);
+  for (let i = 0; i < CLUSTER_WORKERS; i++) cluster.fork();
 
-process.on('SIGINT', () => {
-  console.log('🔄 Server shutting down...');
-  process.exit(0);
-});
\ No newline at end of file
+  // The primary probes once for the whole cluster and broadcasts each result
+  apiProbe.onResult(status => {
+    Object.values(cluster.workers).forEach(worker => worker.send({ type: 'api-status', status }));
+  });
+  cluster.on('online', worker => {
+    const { last } = apiProbe.snapshot();
+    if (last) worker.send({ type: 'api-status', status: last });
+    worker.send({ type: 'warmup', warmup });
+  });
+  apiProbe.start();
+
+  // Warming fills the shared cache tier, so the primary does it once for every worker
+  warmCaches(state => {
+    Object.values(cluster.workers).forEach(worker => worker.send({ type: 'warmup', warmup: state }));
+  });
+
+  let shuttingDown = false;
+  cluster.on('exit', (worker, code, signal) => {
+    if (shuttingDown) return;
+    console.warn(`⚠️  Worker ${worker.process.pid} exited (${signal || code}), restarting`);
+    cluster.fork();
+  });
+
+  setInterval(() => pruneCacheDir(CACHE_DIR), 10 * 60 * 1000).unref();
+
+  const shutdown = () => {
+    shuttingDown = true;
+    console.log('🔄 Server shutting down...');
+    Object.values(cluster.workers).forEach(worker => worker.kill('SIGTERM'));
+    queryLog.flush().finally(() => process.exit(0));
+  };
+  process.on('SIGTERM', shutdown);
+  process.on('SIGINT', shutdown);
+} else {
+  startServer();
+
+  if (cluster.isWorker) {
+    process.on('message', message => {
+      if (message && message.type === 'api-status') apiProbe.record(message.status);
+      if (message && message.type === 'warmup') Object.assign(warmup, message.warmup);
+    });
+  } else {
+    apiProbe.start();
+    warmCaches();
+  }
+
+  if (CACHE_DIR && !cluster.isWorker) {
+    setInterval(() => pruneCacheDir(CACHE_DIR), 10 * 60 * 1000).unref();
+  }
+
+  process.on('SIGTERM', () => {
+    console.log('🔄 Server shutting down...');
+    Promise.all([queryLog.flush(), accessLog && accessLog.close()]).finally(() => process.exit(0));
+  });
+
+  process.on('SIGINT', () => {
+    console.log('🔄 Server shutting down...');
+    Promise.all([queryLog.flush(), accessLog && accessLog.close()]).finally(() => process.exit(0));
+  });
+}
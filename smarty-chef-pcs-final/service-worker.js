@@ -1,4 +1,4 @@
-const CACHE_NAME = 'smarty-chef-pcs-v2.0.0';
+const CACHE_NAME = 'smarty-chef-pcs-v2.1.0';
 const urlsToCache = [
   '/',
   '/app.js',
@@ -13,19 +13,36 @@ self.addEventListener('install', event => {
   event.waitUntil(
     caches.open(CACHE_NAME)
       .then(cache => cache.addAll(urlsToCache))
+      .then(() => self.skipWaiting())
   );
 });
 
-// Fetch event
+// Fetch event: the app shell is stale-while-revalidate. The cached copy answers at once
+// (and offline) while a fetch refreshes it, so a deploy shows up on the next load. The
+// fetch goes through the HTTP cache, so an unchanged file costs a 304 against its ETag.
+// API calls and everything else go straight to the network.
 self.addEventListener('fetch', event => {
+  const url = new URL(event.request.url);
+  if (event.request.method !== 'GET' || url.origin !== self.location.origin || !urlsToCache.includes(url.pathname)) {
+    return;
+  }
+
   event.respondWith(
-    caches.match(event.request)
-      .then(response => {
-        if (response) {
-          return response;
+    caches.open(CACHE_NAME).then(cache =>
+      cache.match(event.request).then(cached => {
+        const refreshed = fetch(event.request)
+          .then(response => {
+            if (response.ok) cache.put(event.request, response.clone());
+            return response;
+          });
+
+        if (cached) {
+          event.waitUntil(refreshed.catch(() => {}));
+          return cached;
         }
-        return fetch(event.request);
+        return refreshed;
       })
+    )
   );
 });
 
@@ -40,6 +57,6 @@ self.addEventListener('activate', event => {
           }
         })
       );
-    })
+    }).then(() => self.clients.claim())
   );
-});
\ No newline at end of file
+});
@@ -0,0 +1,101 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { createAdmissionController, OverloadedError } = require('../admission');
+
+// Request durations are measured with Date.now, so a fake clock sets them exactly
+function useClock(t) {
+  const clock = { now: 0 };
+  const realNow = Date.now;
+  Date.now = () => clock.now;
+  t.after(() => { Date.now = realNow; });
+  return clock;
+}
+
+async function run(admission, clock, durationMs) {
+  const release = await admission.acquire('client');
+  clock.now += durationMs;
+  release();
+}
+
+test('the limit shrinks by 10% while latency is over target, down to the minimum', async (t) => {
+  const clock = useClock(t);
+  const admission = createAdmissionController({ maxConcurrent: 10, minConcurrent: 4, targetLatencyMs: 100 });
+
+  const limits = [];
+  for (let i = 0; i < 7; i++) {
+    await run(admission, clock, 500);
+    limits.push(admission.limit);
+  }
+  assert.deepEqual(limits, [9, 8, 7, 6, 5, 4, 4]);
+});
+
+test('the limit grows by one per request under target, only while it is used', async (t) => {
+  const clock = useClock(t);
+  const admission = createAdmissionController({ maxConcurrent: 10, minConcurrent: 4, targetLatencyMs: 100 });
+  while (admission.limit > 4) await run(admission, clock, 500);
+  // Let the smoothed latency fall under target
+  while (admission.latencyMs >= 100) await run(admission, clock, 0);
+
+  // One request at a time leaves the limit unused, so it stays put
+  const before = admission.limit;
+  await run(admission, clock, 0);
+  assert.equal(admission.limit, before);
+
+  // At full use each fast completion adds one, up to maxConcurrent
+  const limits = [];
+  for (let i = 0; i < 10; i++) {
+    const releases = await Promise.all(Array.from({ length: admission.limit }, () => admission.acquire('client')));
+    releases.forEach(release => release());
+    limits.push(admission.limit);
+  }
+  assert.deepEqual(limits, [before + 1, before + 2, before + 3, before + 4, before + 5, before + 6, 10, 10, 10, 10]);
+});
+
+test('a fixed limit does not adapt without a target latency', async (t) => {
+  const clock = useClock(t);
+  const admission = createAdmissionController({ maxConcurrent: 3 });
+  await run(admission, clock, 60000);
+  assert.equal(admission.limit, 3);
+});
+
+test('requests are shed when the shared or per-client queue is full', async () => {
+  const admission = createAdmissionController({ maxConcurrent: 1, maxQueue: 2, maxQueuePerClient: 1, maxWaitMs: 1000 });
+  const release = await admission.acquire('a');
+
+  const queued = admission.acquire('b');
+  await assert.rejects(admission.acquire('b'), (err) =>
+    err instanceof OverloadedError && err.reason === 'client_queue_full' && err.retryAfterSeconds >= 1
+  );
+  const queuedC = admission.acquire('c');
+  await assert.rejects(admission.acquire('d'), (err) => err instanceof OverloadedError && err.reason === 'queue_full');
+  assert.deepEqual(admission.stats.rejected, { queue_full: 1, client_queue_full: 1, timeout: 0 });
+
+  release();
+  (await queued)();
+  (await queuedC)();
+  assert.equal(admission.inFlight, 0);
+});
+
+test('queued requests time out after maxWaitMs', async () => {
+  const admission = createAdmissionController({ maxConcurrent: 1, maxWaitMs: 10 });
+  const release = await admission.acquire('a');
+  await assert.rejects(admission.acquire('b'), (err) => err instanceof OverloadedError && err.reason === 'timeout');
+  assert.equal(admission.queued, 0);
+  release();
+});
+
+test('waiting clients are admitted round-robin', async () => {
+  const admission = createAdmissionController({ maxConcurrent: 1, maxWaitMs: 1000 });
+  const order = [];
+  const release = await admission.acquire('x');
+
+  const waiting = [['a', 1], ['a', 2], ['a', 3], ['b', 1]].map(([client, n]) =>
+    admission.acquire(client).then(done => {
+      order.push(`${client}${n}`);
+      setImmediate(done);
+    })
+  );
+  release();
+  await Promise.all(waiting);
+  assert.deepEqual(order, ['a1', 'b1', 'a2', 'a3']);
+});
@@ -0,0 +1,95 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { ALLERGEN_GROUPS, resolveAllergens, compileAllergenMatcher } = require('../allergens');
+const localRecipes = require('../local-recipes.json');
+
+test('resolveAllergens maps aliases to groups and keeps unknown terms', () => {
+  assert.deepEqual(resolveAllergens('Nuts, milk, kiwi'), { groups: ['tree nuts', 'peanuts', 'dairy'], terms: ['kiwi'] });
+  assert.deepEqual(resolveAllergens(['eggs', ' ']), { groups: ['egg'], terms: [] });
+  assert.deepEqual(resolveAllergens('seafood'), { groups: ['shellfish', 'fish'], terms: [] });
+});
+
+test('"nuts" covers peanuts', () => {
+  const nuts = compileAllergenMatcher('nuts');
+  assert.ok(nuts.matches('2 tbsp peanuts'));
+  assert.ok(nuts.matches('roasted groundnuts'));
+
+  const poha = localRecipes.find(recipe => recipe.title === 'Kanda Poha');
+  assert.ok(nuts.matches(poha.title + ' ' + poha.ingredients.join('\n')));
+});
+
+test('"seafood" covers shellfish', () => {
+  assert.ok(compileAllergenMatcher('seafood').matches('250g shrimp, peeled'));
+  assert.ok(compileAllergenMatcher('seafood').matches('1 salmon fillet'));
+});
+
+test('nut and seafood aliases map to every upstream intolerance', () => {
+  const intolerances = (allergies) =>
+    resolveAllergens(allergies).groups.map(group => ALLERGEN_GROUPS[group].intolerance);
+  assert.deepEqual(intolerances('nuts').sort(), ['peanut', 'tree nut']);
+  assert.deepEqual(intolerances('seafood').sort(), ['seafood', 'shellfish']);
+});
+
+test('terms match as prefixes and inside compound words', () => {
+  assert.ok(compileAllergenMatcher('milk').matches('1 milkshake'));
+  assert.ok(compileAllergenMatcher('cheese').matches('a slice of cheesecake'));
+  assert.ok(compileAllergenMatcher('egg').matches('1 cup eggnog'));
+  assert.ok(compileAllergenMatcher('kiwi').matches('2 kiwifruit'));
+  assert.ok(compileAllergenMatcher('egg').matches('2 eggs'));
+  assert.ok(compileAllergenMatcher('apple').matches('1 cup pineapple chunks'));
+  assert.ok(compileAllergenMatcher('dairy').matches('1 cup buttermilk'));
+});
+
+test('listed compound words are exceptions', () => {
+  assert.ok(!compileAllergenMatcher('egg').matches('1 eggplant, cubed'));
+  assert.ok(!compileAllergenMatcher('egg').matches('mixed veggies'));
+  assert.ok(!compileAllergenMatcher('nuts').matches('1 butternut squash, a pinch of nutmeg'));
+  assert.ok(!compileAllergenMatcher('nuts').matches('grated coconut, soak 20 minutes'));
+  assert.ok(!compileAllergenMatcher('dairy').matches('butternut squash soup'));
+  assert.ok(!compileAllergenMatcher('gluten').matches('buckwheat groats'));
+  assert.ok(!compileAllergenMatcher('soy').matches('tamarind paste'));
+  assert.ok(!compileAllergenMatcher('fish').matches('zest and peel of 1 orange'));
+});
+
+test('case and plurals are folded', () => {
+  const matcher = compileAllergenMatcher('nuts, egg');
+  assert.deepEqual(matcher.findAllergens('Toasted ALMONDS and 3 Eggs'), ['almond', 'egg']);
+  assert.ok(matcher.matches('Cashews'));
+  assert.ok(compileAllergenMatcher('tomato').matches('Tomatoes'));
+});
+
+test('overlapping patterns are all reported', () => {
+  const matcher = compileAllergenMatcher('nuts, peanuts');
+  assert.deepEqual(matcher.findAllergens('peanut').sort(), ['peanut']);
+  assert.deepEqual(matcher.findAllergens('pine nuts').sort(), ['nut', 'pine nut']);
+  assert.deepEqual(matcher.findAllergens('chestnut purée').sort(), ['chestnut', 'nut']);
+});
+
+test('safe phrases mask only their own group', () => {
+  const dairy = compileAllergenMatcher('dairy');
+  assert.ok(!dairy.matches('2 tbsp peanut butter'));
+  assert.ok(!dairy.matches('1 can coconut milk'));
+  assert.ok(dairy.matches('2 tbsp peanut butter and 1 tbsp butter'));
+
+  const both = compileAllergenMatcher('dairy, peanuts');
+  assert.deepEqual(both.findAllergens('peanut butter'), ['peanut']);
+
+  const nuts = compileAllergenMatcher('nuts');
+  assert.ok(!nuts.matches('sliced water chestnuts'));
+  assert.deepEqual(compileAllergenMatcher('tree nuts').findAllergens('peanut'), []);
+  assert.ok(nuts.matches('water chestnuts and walnuts'));
+});
+
+test('a known-unsafe ingredient is caught', () => {
+  const recipe = 'Palak Paneer: spinach, paneer, onion, garlic, 1 tbsp ghee';
+  assert.ok(compileAllergenMatcher('dairy').matches(recipe));
+  assert.ok(compileAllergenMatcher('gluten').matches('2 cups atta, water, salt'));
+  assert.ok(!compileAllergenMatcher('gluten').matches('1 cup rice flour'));
+  assert.ok(compileAllergenMatcher('shellfish').matches('500g Prawns'));
+});
+
+test('an empty allergy list matches nothing', () => {
+  const matcher = compileAllergenMatcher('');
+  assert.ok(matcher.isEmpty);
+  assert.ok(!matcher.matches('milk, eggs, peanuts'));
+});
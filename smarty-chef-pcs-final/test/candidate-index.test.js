@@ -0,0 +1,35 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { createCandidateIndex, compactCandidate, rescoreCandidates } = require('../candidate-index');
+
+const candidate = (id, used, missed = []) => ({
+  id,
+  likes: 0,
+  usedIngredients: used.map(name => ({ name })),
+  missedIngredients: missed.map(name => ({ name }))
+});
+
+test('rescoring for a qualifier-only selection ignores the bare qualifier', () => {
+  const cached = [
+    compactCandidate(candidate(1, ['chicken thighs', 'onion'], ['eggs'])),
+    compactCandidate(candidate(2, ['red bell pepper', 'brown sugar']))
+  ];
+
+  const [curry, pepper] = rescoreCandidates(cached, ['Egg (Chicken)']);
+  assert.deepEqual(curry.usedIngredients, [{ name: 'eggs' }]);
+  assert.equal(curry.missedIngredientCount, 2);
+  assert.equal(pepper.usedIngredientCount, 0);
+
+  assert.equal(rescoreCandidates(cached, ['Lentils (Red)', 'Rice (Brown)'])[1].usedIngredientCount, 0);
+});
+
+test('plan reuses a cached superset and covers the rest with subsets', () => {
+  const index = createCandidateIndex();
+  index.add(['onion', 'tomato'], [candidate(1, ['onion', 'tomato'])]);
+  index.add(['garlic'], [candidate(2, ['garlic'])]);
+
+  assert.deepEqual(index.plan(['tomato']).missing, []);
+  const plan = index.plan(['onion', 'tomato', 'garlic', 'ginger']);
+  assert.deepEqual(plan.missing, ['ginger']);
+  assert.deepEqual(plan.candidates.map(c => c.id).sort(), [1, 2]);
+});
@@ -0,0 +1,88 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { createKeyPool } = require('../key-pool');
+
+function useClock(t, now) {
+  const clock = { now };
+  const realNow = Date.now;
+  Date.now = () => clock.now;
+  t.after(() => { Date.now = realNow; });
+  return clock;
+}
+
+const quota = (left) => ({ left });
+
+test('requests go to the key with the most quota left, unseen keys first', () => {
+  const pool = createKeyPool(['aaaa1111', 'bbbb2222', '', 'aaaa1111']);
+  assert.equal(pool.size, 2);
+
+  const first = pool.acquire();
+  pool.release(first, { status: 200, quota: quota(50) });
+  const second = pool.acquire();
+  assert.notEqual(second, first);
+  pool.release(second, { status: 200, quota: quota(80) });
+
+  const next = pool.acquire();
+  assert.equal(next, second);
+  pool.release(next, { status: 200 });
+  assert.equal(pool.acquire([second]), first);
+});
+
+test('a 429 cools the key down and requests rotate to the other key', (t) => {
+  const clock = useClock(t, 0);
+  const pool = createKeyPool(['aaaa1111', 'bbbb2222'], { rateLimitCooldownMs: 1000, maxCooldownMs: 3000 });
+
+  const limited = pool.acquire();
+  pool.release(limited, { status: 429 });
+  const other = pool.acquire();
+  assert.notEqual(other, limited);
+  pool.release(other, { status: 429 });
+  assert.equal(pool.acquire(), null);
+
+  const state = pool.snapshot()[0];
+  assert.equal(state.available, false);
+  assert.equal(state.cooldownReason, 'rate_limit');
+  assert.equal(state.cooldownRemainingMs, 1000);
+
+  clock.now = 1000;
+  const retried = pool.acquire();
+  assert.equal(retried, limited);
+  pool.release(retried, { status: 429 });
+  assert.equal(pool.snapshot()[0].cooldownRemainingMs, 2000);
+});
+
+test('the 429 cooldown doubles up to the cap and resets after a success', (t) => {
+  const clock = useClock(t, 0);
+  const pool = createKeyPool(['aaaa1111'], { rateLimitCooldownMs: 1000, maxCooldownMs: 3000 });
+
+  const cooldowns = [];
+  for (let i = 0; i < 4; i++) {
+    pool.release(pool.acquire(), { status: 429 });
+    cooldowns.push(pool.snapshot()[0].cooldownRemainingMs);
+    clock.now += cooldowns[i];
+  }
+  assert.deepEqual(cooldowns, [1000, 2000, 3000, 3000]);
+
+  pool.release(pool.acquire(), { status: 200 });
+  pool.release(pool.acquire(), { status: 429 });
+  assert.equal(pool.snapshot()[0].cooldownRemainingMs, 1000);
+});
+
+test('a 402 rests the key until the quota resets at midnight UTC', (t) => {
+  const clock = useClock(t, Date.UTC(2024, 0, 1, 18, 0));
+  const pool = createKeyPool(['aaaa1111']);
+  pool.release(pool.acquire(), { status: 402 });
+
+  assert.equal(pool.snapshot()[0].cooldownReason, 'quota');
+  assert.equal(pool.snapshot()[0].cooldownRemainingMs, 6 * 60 * 60 * 1000);
+  clock.now = Date.UTC(2024, 0, 2);
+  assert.ok(pool.acquire());
+});
+
+test('the snapshot carries no key material', () => {
+  const pool = createKeyPool(['secretkeyAAAA', 'secretkeyBBBB']);
+  const snapshot = pool.snapshot();
+  assert.deepEqual(snapshot.map(({ index, name }) => [index, name]), [[0, 'key1'], [1, 'key2']]);
+  const text = JSON.stringify(snapshot);
+  ['secret', 'AAAA', 'BBBB'].forEach(fragment => assert.ok(!text.includes(fragment)));
+});
@@ -0,0 +1,23 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { createLocalCorpus } = require('../local-recipes');
+
+const corpus = createLocalCorpus(require('../local-recipes.json'));
+const titles = (ingredients) => corpus.search(ingredients).map(recipe => recipe.title);
+
+test('a qualifier-only bracket does not select recipes', () => {
+  const eggRecipes = titles(['Egg (Chicken)']);
+  assert.ok(eggRecipes.includes('Egg Bhurji'));
+  assert.ok(!eggRecipes.some(title => /chicken/i.test(title)));
+});
+
+test('synonyms in brackets still match', () => {
+  assert.ok(titles(['Chickpeas (Garbanzo)']).length > 0);
+  assert.ok(titles(['Lentils (Red)']).includes('Masoor Dal Soup'));
+});
+
+test('served recipes omit the index-only mainIngredients', () => {
+  const [recipe] = corpus.search(['Tomato'], 1);
+  assert.equal(recipe.mainIngredients, undefined);
+  assert.equal(corpus.get(recipe.id), recipe);
+});
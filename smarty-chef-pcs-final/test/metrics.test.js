@@ -0,0 +1,22 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const metrics = require('../metrics');
+
+test('default labels are added to every series', () => {
+  const requests = metrics.counter('test_requests_total', 'Test counter');
+  const duration = metrics.histogram('test_duration_seconds', 'Test histogram', [1]);
+  const idle = metrics.gauge('test_idle', 'Test gauge');
+  requests.inc({ route: '/a' });
+  duration.observe({}, 0.5);
+  idle.set({}, 1);
+
+  metrics.setDefaultLabels({ worker: 3 });
+  const output = metrics.render();
+  metrics.setDefaultLabels({});
+
+  assert.match(output, /^test_requests_total\{worker="3",route="\/a"\} 1$/m);
+  assert.match(output, /^test_duration_seconds_bucket\{worker="3",le="1"\} 1$/m);
+  assert.match(output, /^test_duration_seconds_count\{worker="3"\} 1$/m);
+  assert.match(output, /^test_idle\{worker="3"\} 1$/m);
+  assert.match(metrics.render(), /^test_idle 1$/m);
+});
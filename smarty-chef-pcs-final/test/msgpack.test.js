@@ -0,0 +1,64 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { encode } = require('../msgpack');
+
+const bytes = (value) => [...encode(value)];
+const head = (value, length) => bytes(value).slice(0, length);
+
+test('integers use the smallest format at each boundary', () => {
+  assert.deepEqual(bytes(0), [0x00]);
+  assert.deepEqual(bytes(127), [0x7f]);
+  assert.deepEqual(bytes(128), [0xcc, 0x80]);
+  assert.deepEqual(bytes(255), [0xcc, 0xff]);
+  assert.deepEqual(bytes(256), [0xcd, 0x01, 0x00]);
+  assert.deepEqual(bytes(65535), [0xcd, 0xff, 0xff]);
+  assert.deepEqual(bytes(65536), [0xce, 0x00, 0x01, 0x00, 0x00]);
+  assert.deepEqual(bytes(0xffffffff), [0xce, 0xff, 0xff, 0xff, 0xff]);
+
+  assert.deepEqual(bytes(-1), [0xff]);
+  assert.deepEqual(bytes(-32), [0xe0]);
+  assert.deepEqual(bytes(-33), [0xd0, 0xdf]);
+  assert.deepEqual(bytes(-128), [0xd0, 0x80]);
+  assert.deepEqual(bytes(-129), [0xd1, 0xff, 0x7f]);
+  assert.deepEqual(bytes(-32768), [0xd1, 0x80, 0x00]);
+  assert.deepEqual(bytes(-32769), [0xd2, 0xff, 0xff, 0x7f, 0xff]);
+  assert.deepEqual(bytes(-0x80000000), [0xd2, 0x80, 0x00, 0x00, 0x00]);
+});
+
+test('floats and integers beyond 32 bits are float64; non-finite numbers are nil', () => {
+  assert.deepEqual(bytes(1.5), [0xcb, 0x3f, 0xf8, 0, 0, 0, 0, 0, 0]);
+  assert.equal(encode(2 ** 32).readDoubleBE(1), 2 ** 32);
+  assert.equal(encode(-0x80000001).readDoubleBE(1), -0x80000001);
+  assert.deepEqual(bytes(NaN), [0xc0]);
+  assert.deepEqual(bytes(Infinity), [0xc0]);
+});
+
+test('string headers switch at the fixstr, str8 and str16 boundaries', () => {
+  assert.deepEqual(head('a'.repeat(31), 1), [0xbf]);
+  assert.deepEqual(head('a'.repeat(32), 2), [0xd9, 32]);
+  assert.deepEqual(head('a'.repeat(255), 2), [0xd9, 0xff]);
+  assert.deepEqual(head('a'.repeat(256), 3), [0xda, 0x01, 0x00]);
+  assert.deepEqual(head('a'.repeat(65535), 3), [0xda, 0xff, 0xff]);
+  assert.deepEqual(head('a'.repeat(65536), 5), [0xdb, 0x00, 0x01, 0x00, 0x00]);
+  // Lengths are UTF-8 bytes, not characters
+  assert.deepEqual(bytes('é'), [0xa2, 0xc3, 0xa9]);
+  assert.equal(encode('a'.repeat(300)).length, 3 + 300);
+});
+
+test('map and array headers switch at the fix and 16-bit boundaries', () => {
+  const object = (size) => Object.fromEntries(Array.from({ length: size }, (_, i) => [`k${i}`, i]));
+  assert.deepEqual(head(object(15), 1), [0x8f]);
+  assert.deepEqual(head(object(16), 3), [0xde, 0x00, 0x10]);
+  assert.deepEqual(head(object(65536), 5), [0xdf, 0x00, 0x01, 0x00, 0x00]);
+
+  assert.deepEqual(head(new Array(15).fill(0), 1), [0x9f]);
+  assert.deepEqual(head(new Array(16).fill(0), 3), [0xdc, 0x00, 0x10]);
+  assert.deepEqual(head(new Array(65536).fill(0), 5), [0xdd, 0x00, 0x01, 0x00, 0x00]);
+});
+
+test('values are encoded the way JSON.stringify would', () => {
+  assert.deepEqual(bytes({ a: 1, b: undefined, c: () => {} }), [0x81, 0xa1, 0x61, 0x01]);
+  assert.deepEqual(bytes([undefined, null, true, false]), [0x94, 0xc0, 0xc0, 0xc3, 0xc2]);
+  const date = new Date(0);
+  assert.deepEqual(encode({ date }), encode({ date: date.toJSON() }));
+});
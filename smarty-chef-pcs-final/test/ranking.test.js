@@ -0,0 +1,33 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { namesFor, compileSelection, popcount, rankCandidates } = require('../ranking');
+
+const covers = (selection, name) => popcount(compileSelection([selection]).bitsetFor([name])) > 0;
+
+test('namesFor keeps the main name, combined forms and real synonyms', () => {
+  assert.deepEqual(namesFor('Onion (Red)'), ['onion', 'red onion']);
+  assert.deepEqual(namesFor('Cumin Seeds (Jeera)'), ['cumin seeds', 'jeera cumin seeds', 'jeera']);
+  assert.deepEqual(namesFor('Dahi (Curd/Yogurt)'), ['dahi', 'curd dahi', 'yogurt dahi', 'curd', 'yogurt']);
+});
+
+test('bracketed qualifiers never match on their own', () => {
+  assert.ok(!covers('Egg (Chicken)', 'chicken breast'));
+  assert.ok(covers('Egg (Chicken)', 'eggs'));
+  assert.ok(!covers('Lentils (Red)', 'red bell pepper'));
+  assert.ok(covers('Lentils (Red)', 'red lentils'));
+  assert.ok(!covers('Rice (Brown)', 'brown sugar'));
+  assert.ok(!covers('Rasmalai Base (Chhena + Cream)', 'heavy cream'));
+});
+
+test('plurals match through the e?s suffix', () => {
+  assert.ok(covers('Tomato', 'tomatoes'));
+  assert.ok(covers('Chickpeas (Garbanzo)', 'garbanzo beans'));
+});
+
+test('rankCandidates does not credit qualifier-only matches', () => {
+  const candidates = [
+    { id: 1, usedIngredients: [{ name: 'chicken thighs' }], usedIngredientCount: 1, missedIngredientCount: 3 },
+    { id: 2, usedIngredients: [{ name: 'eggs' }], usedIngredientCount: 1, missedIngredientCount: 3 }
+  ];
+  assert.deepEqual(rankCandidates(candidates, ['Egg (Chicken)']).map(c => c.id), [2, 1]);
+});